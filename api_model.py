@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+import json
+import threading
+from pathlib import Path
+from typing import Dict
+
+from googleapiclient.model import JsonModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+DISCOVERY_URL = 'https://www.googleapis.com/discovery/v1/apis/youtube/v3/rest'
+DISCOVERY_CACHE_FILE = Path('reports') / '.discovery_youtube_v3.json'
+
+# Api resources the scraper calls
+API_RESOURCES = ('channels', 'search', 'playlistItems', 'videos', 'commentThreads', 'comments')
+
+_discovery_document = None
+_discovery_lock = threading.Lock()
+
+
+def orjson_available() -> bool:
+    return orjson is not None
+
+
+class FastJsonModel(JsonModel):
+    """
+    JsonModel that decodes Api responses with orjson when it is installed.
+
+    orjson parses a page of comments several times faster than the json module;
+    without it (or for anything it rejects) the stock decoder is used.
+    """
+
+    def deserialize(self, content):
+        if orjson is None:
+            return super().deserialize(content)
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return super().deserialize(content)
+        if self._data_wrapper and isinstance(body, dict) and 'data' in body:
+            body = body['data']
+        return body
+
+
+def _read_discovery_document(http) -> str:
+    # google-api-python-client 2.x bundles the document; older versions download it once
+    try:
+        from googleapiclient.discovery_cache import get_static_doc
+        content = get_static_doc('youtube', 'v3')
+    except ImportError:
+        content = None
+    if content:
+        return content
+
+    if DISCOVERY_CACHE_FILE.exists():
+        return DISCOVERY_CACHE_FILE.read_text(encoding='utf-8')
+
+    response, content = http.request(DISCOVERY_URL)
+    if response.status != 200:
+        raise RuntimeError(f"Unable To Download The Api Discovery Document (Http {response.status})")
+    content = content.decode('utf-8')
+    DISCOVERY_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    DISCOVERY_CACHE_FILE.write_text(content, encoding='utf-8')
+    return content
+
+
+def discovery_document(http) -> Dict:
+    """
+    The YouTube Api discovery document, read and parsed once per process.
+    """
+    global _discovery_document
+    with _discovery_lock:
+        if _discovery_document is None:
+            from googleapiclient.discovery import build_from_document
+
+            document = json.loads(_read_discovery_document(http))
+            # Creating a resource fills in its methods' parameters in the document; doing it
+            # once here means clients sharing the document never modify it concurrently
+            client = build_from_document(document, http=http)
+            for resource in API_RESOURCES:
+                getattr(client, resource)()
+            _discovery_document = document
+        return _discovery_document
+
+
+def build_client(api_key: str, http):
+    # Imported on first use: googleapiclient.discovery is the slowest import of a cold start
+    from googleapiclient.discovery import build_from_document
+
+    return build_from_document(discovery_document(http), developerKey=api_key, http=http, model=FastJsonModel())
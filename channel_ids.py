@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_CHANNEL_IDS_FILE = Path('reports') / '.channel_ids.json'
+
+# Channels that could not be found are looked up again after this long
+NEGATIVE_TTL = 7 * 24 * 3600
+
+MISSING = object()
+
+
+class ChannelIdCache:
+    """
+    Persistent handle / username / url -> channel id map.
+
+    Misses are remembered too (as None) so unknown channels do not cost a
+    100 unit search on every run; they expire after NEGATIVE_TTL.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CHANNEL_IDS_FILE):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries = {}
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+    @staticmethod
+    def key(kind: str, value: str) -> str:
+        return f"{kind}:{value.strip().lstrip('@').lower()}"
+
+    def get(self, key: str):
+        # Returns the channel id, None for a remembered miss, or MISSING when unknown
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return MISSING
+        if entry['channel_id'] is None and time.time() - entry['resolved_at'] > NEGATIVE_TTL:
+            return MISSING
+        return entry['channel_id']
+
+    def set(self, key: str, channel_id: Optional[str]):
+        with self._lock:
+            self._entries[key] = {'channel_id': channel_id, 'resolved_at': time.time()}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False, indent=2)
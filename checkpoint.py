@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+import json
+from pathlib import Path
+from typing import List, Dict, Optional
+
+
+class Checkpoint:
+    """
+    Append-only Json Lines journal of a channel scrape, used by --resume.
+
+    Every event is flushed as soon as it is recorded, so the journal always
+    describes work that has already been committed to the comment store.
+    """
+
+    def __init__(self, path: Path, resume: bool = False):
+        self.path = Path(path)
+        self.timestamp = None
+        self.comment_count = 0
+        self.videos: List[Dict] = []
+        self.videos_page_token = None
+        self.videos_complete = False
+        self.page_tokens: Dict[str, str] = {}
+        self.completed_videos = set()
+
+        if resume and self.path.exists():
+            self._load()
+            self._journal = open(self.path, 'a', encoding='utf-8')
+        else:
+            self._journal = open(self.path, 'w', encoding='utf-8')
+
+    @property
+    def resuming(self) -> bool:
+        return self.timestamp is not None
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn last line from a crash mid-write
+                    break
+                self._apply(event)
+
+    def _apply(self, event: Dict):
+        kind = event['event']
+        if kind == 'start':
+            self.timestamp = event['timestamp']
+        elif kind == 'videos_page':
+            self.videos.extend(event['videos'])
+            self.videos_page_token = event['next_page_token']
+        elif kind == 'videos_complete':
+            self.videos_complete = True
+        elif kind == 'comments_page':
+            self.page_tokens[event['video_id']] = event['next_page_token']
+            self.comment_count = event['comment_count']
+        elif kind == 'video_done':
+            self.page_tokens.pop(event['video_id'], None)
+            self.completed_videos.add(event['video_id'])
+
+    def _record(self, event: Dict):
+        self._journal.write(json.dumps(event, ensure_ascii=False) + '\n')
+        self._journal.flush()
+
+    def record_start(self, timestamp: str):
+        self.timestamp = timestamp
+        self._record({'event': 'start', 'timestamp': timestamp})
+
+    def record_videos_page(self, videos: List[Dict], next_page_token: Optional[str]):
+        self.videos.extend(videos)
+        self.videos_page_token = next_page_token
+        self._record({'event': 'videos_page', 'videos': videos, 'next_page_token': next_page_token})
+
+    def record_videos_complete(self):
+        self.videos_complete = True
+        self._record({'event': 'videos_complete'})
+
+    def record_comments_page(self, video_id: str, next_page_token: Optional[str], comment_count: int):
+        # Called after the page has been committed to the store
+        self.comment_count = comment_count
+        self.page_tokens[video_id] = next_page_token
+        self._record({
+            'event': 'comments_page',
+            'video_id': video_id,
+            'next_page_token': next_page_token,
+            'comment_count': comment_count
+        })
+
+    def record_video_done(self, video_id: str):
+        self.page_tokens.pop(video_id, None)
+        self.completed_videos.add(video_id)
+        self._record({'event': 'video_done', 'video_id': video_id})
+
+    def close(self):
+        self._journal.close()
+
+    def finish(self):
+        self._journal.close()
+        self.path.unlink()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Union
+
+FIELDS = (
+    'video_id', 'comment_id', 'author', 'author_channel_id', 'text', 'like_count',
+    'published_at', 'updated_at', 'is_reply', 'parent_id',
+    'video_title', 'video_published_at', 'channel_name'
+)
+
+# Values repeated across many comments (ids, names, titles) are shared instead of copied
+INTERNED_FIELDS = frozenset({
+    'video_id', 'author', 'author_channel_id', 'parent_id', 'video_title', 'channel_name'
+})
+TIMESTAMP_FIELDS = frozenset({'published_at', 'updated_at', 'video_published_at'})
+
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+EPOCH = datetime(1970, 1, 1)
+SECOND = timedelta(seconds=1)
+
+
+def parse_timestamp(value: Optional[str]) -> Union[int, str, None]:
+    # Api timestamps (2024-02-01T12:00:00Z) become epoch seconds; anything else is kept
+    # verbatim so the conversion back is always lossless
+    if (not value or len(value) != 20 or value[10] != 'T' or value[19] != 'Z' or
+            value[4:8:3] != '--' or value[13:17:3] != '::'):
+        return value
+    # fromisoformat is about ten times faster than strptime; the separators checked above
+    # leave it only the one layout (no week dates or offsets)
+    try:
+        return (datetime.fromisoformat(value[:-1]) - EPOCH) // SECOND
+    except ValueError:
+        return value
+
+
+def format_timestamp(value: Union[int, str, None]) -> Optional[str]:
+    if isinstance(value, int):
+        return time.strftime(TIMESTAMP_FORMAT, time.gmtime(value))
+    return value
+
+
+class Comment:
+    """
+    Slotted comment record, a fraction of the size of the equivalent dict.
+
+    Repeated strings are interned and timestamps are held as epoch seconds.
+    comment['field'] reads and writes the classic dict values (Iso timestamps),
+    and to_dict() converts back to the report schema losslessly.
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, **values):
+        for field in FIELDS:
+            self[field] = values.get(field)
+
+    @classmethod
+    def from_dict(cls, values: Dict) -> 'Comment':
+        return cls(**values)
+
+    def __getitem__(self, field: str):
+        if field not in FIELDS:
+            raise KeyError(field)
+        value = getattr(self, field)
+        return format_timestamp(value) if field in TIMESTAMP_FIELDS else value
+
+    def __setitem__(self, field: str, value):
+        if field not in FIELDS:
+            raise KeyError(field)
+        if field in TIMESTAMP_FIELDS:
+            value = parse_timestamp(value)
+        elif field in INTERNED_FIELDS and isinstance(value, str):
+            value = sys.intern(value)
+        setattr(self, field, value)
+
+    def get(self, field: str, default=None):
+        value = self[field] if field in FIELDS else None
+        return default if value is None else value
+
+    def to_dict(self) -> Dict:
+        return {field: self[field] for field in FIELDS}
+
+    def __eq__(self, other):
+        if isinstance(other, Comment):
+            return all(getattr(self, field) == getattr(other, field) for field in FIELDS)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Comment({self.comment_id!r}, video_id={self.video_id!r})"
@@ -1,23 +1,290 @@
 #!/usr/bin/env python3
 
+import base64
+import gzip
+import heapq
 import json
+import re
+import shutil
 import sys
+import tempfile
+from array import array
+from collections import OrderedDict
 from datetime import datetime
+from itertools import chain, groupby
 from pathlib import Path
+from typing import List, Dict, Iterable, Iterator, Optional
 
-def generate_html_report(json_file: str, output_file: str = None):
+from report_io import iter_report
+
+# Comment cards rendered at once; the rest of the filtered results are paged
+REPORT_PAGE_SIZE = 50
+
+# Author names suggested while typing in the author filter, instead of one option per author
+AUTHOR_SUGGESTIONS = 50
+
+# Word characters, matching the /[\p{L}\p{N}_]+/u tokenizer used by the report's search box
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# Word index positions held in memory before they are written out to a sorted temporary file
+POSTINGS_SPILL_SIZE = 500_000
+# Spilled files merged into one once there are this many, to keep few files open
+MAX_POSTINGS_RUNS = 16
+
+
+def epoch_millis(timestamp: str) -> Optional[int]:
+    try:
+        return int(datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp() * 1000)
+    except (AttributeError, ValueError):
+        return None
+
+
+def script_json(value) -> str:
+    # Compact Json that is safe inside a <script> element
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+
+
+class ReportStats:
+    """
+    Header numbers of the report, gathered in the same pass that writes the comments.
+    """
+
+    def __init__(self):
+        self.comments = 0
+        self.likes = 0
+        self.replies = 0
+        self.authors = set()
+        self.videos = set()
+
+    def counted(self, comments: Iterable[Dict]) -> Iterator[Dict]:
+        for comment in comments:
+            self.comments += 1
+            self.likes += comment['like_count']
+            self.replies += 1 if comment['is_reply'] else 0
+            self.authors.add(comment['author'])
+            self.videos.add(comment['video_id'])
+            yield comment
+
+    def as_dict(self) -> Dict:
+        return {
+            'statComments': self.comments,
+            'statAuthors': len(self.authors),
+            'statVideos': len(self.videos),
+            'statLikes': self.likes,
+            'statTopLevel': self.comments - self.replies,
+            'statReplies': self.replies
+        }
+
+
+def posting_token(line: str) -> str:
+    return line[:line.index('\t')]
+
+
+class ShardWriter:
+    """
+    Streams one shard of report data to a text file as Json:
+    {"comments": [...], "search": {"texts": [...], "times": [...], "tokens": {...}}}
+
+    The search part is what the report's filters need precomputed: lowercased
+    texts and epoch timestamps parallel to the comments, and every word mapped
+    to the (delta encoded, ascending) positions of the comments containing it.
+    Comments are written as they arrive; texts and times wait in temporary
+    files, and the word index is spilled to sorted temporary files in chunks
+    that are merged at the end, so memory does not grow with the shard.
+    """
+
+    def __init__(self, out):
+        self.out = out
+        self.count = 0
+        self.time_from = None
+        self.time_to = None
+        self.video_ids = set()
+        self._texts = tempfile.TemporaryFile('w+', encoding='utf-8')
+        self._times = tempfile.TemporaryFile('w+', encoding='utf-8')
+        self._postings: Dict[str, array] = {}
+        self._positions = 0
+        self._runs = []
+        self.out.write('{"comments":[')
+
+    def add(self, comment: Dict):
+        separator = ',' if self.count else ''
+        text = comment['text'].lower()
+        time = epoch_millis(comment['published_at'])
+
+        self.out.write(separator + script_json(comment))
+        self._texts.write(separator + script_json(text))
+        self._times.write(separator + json.dumps(time))
+
+        if time is not None:
+            self.time_from = time if self.time_from is None else min(self.time_from, time)
+            self.time_to = time if self.time_to is None else max(self.time_to, time)
+        self.video_ids.add(comment['video_id'])
+
+        for token in dict.fromkeys(TOKEN_PATTERN.findall(text)):
+            positions = self._postings.get(token)
+            if positions is None:
+                positions = self._postings[token] = array('I')
+            positions.append(self.count)
+            self._positions += 1
+        self.count += 1
+        
+        if self._positions >= POSTINGS_SPILL_SIZE:
+            self._spill()
+
+    def _spill(self):
+        # One "token<TAB>position,position,..." line per word, sorted by word
+        run = tempfile.TemporaryFile('w+', encoding='utf-8')
+        for token in sorted(self._postings):
+            run.write(f'{token}\t{",".join(map(str, self._postings[token]))}\n')
+        run.seek(0)
+        self._runs.append(run)
+        self._postings.clear()
+        self._positions = 0
+        
+        if len(self._runs) >= MAX_POSTINGS_RUNS:
+            merged = tempfile.TemporaryFile('w+', encoding='utf-8')
+            merged.writelines(self._merged_lines())
+            merged.seek(0)
+            self._close_runs()
+            self._runs.append(merged)
+
+    def _merged_lines(self) -> Iterator[str]:
+        # Runs are in comment order and merge is stable, so each word's positions stay ascending
+        return heapq.merge(*self._runs, key=posting_token)
+
+    def _close_runs(self):
+        for run in self._runs:
+            run.close()
+        self._runs.clear()
+
+    def finish(self):
+        self.out.write('],"search":{"texts":[')
+        self._copy(self._texts)
+        self.out.write('],"times":[')
+        self._copy(self._times)
+        self.out.write('],"tokens":{')
+        self._spill()
+        for index, (token, group) in enumerate(groupby(self._merged_lines(), key=posting_token)):
+            self.out.write(f'{"," if index else ""}{script_json(token)}:[')
+            previous = 0
+            for number, line in enumerate(group):
+                positions = [int(position) for position in line[len(token) + 1:].split(',')]
+                deltas = [positions[0] - previous] + [b - a for a, b in zip(positions, positions[1:])]
+                self.out.write(f'{"," if number else ""}{",".join(map(str, deltas))}')
+                previous = positions[-1]
+            self.out.write(']')
+        self.out.write('}}}')
+        self._close_runs()
+
+    def _copy(self, spool):
+        spool.seek(0)
+        shutil.copyfileobj(spool, self.out)
+        spool.close()
+
+
+class MonthSpool:
+    """
+    Comments sorted into one temporary Json Lines file per month, with only a
+    bounded number of files open at a time.
+    """
+
+    MAX_OPEN_FILES = 32
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.counts: Dict[str, int] = {}
+        self._open = OrderedDict()
+
+    def add(self, month: str, comment: Dict):
+        handle = self._open.pop(month, None)
+        if handle is None:
+            if len(self._open) >= self.MAX_OPEN_FILES:
+                self._open.popitem(last=False)[1].close()
+            handle = open(self.directory / f'{month}.jsonl', 'a', encoding='utf-8')
+        self._open[month] = handle
+        handle.write(json.dumps(comment, ensure_ascii=False) + '\n')
+        self.counts[month] = self.counts.get(month, 0) + 1
+
+    def close(self):
+        for handle in self._open.values():
+            handle.close()
+        self._open.clear()
+
+    def iter_month(self, month: str) -> Iterator[Dict]:
+        with open(self.directory / f'{month}.jsonl', 'r', encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)
+
+
+def shard_key(comment: Dict) -> str:
+    # Shards are calendar months of the comment's publish date
+    published_at = comment.get('published_at') or ''
+    return published_at[:7] if re.match(r'\d{4}-\d{2}', published_at) else 'unknown'
+
+
+def write_shards(comments: Iterable[Dict], shard_dir: Path) -> List[Dict]:
+    """
+    Write one gzip compressed data file per month next to the report and
+    return the manifest the report uses to load them on demand.
+
+    Shards are Javascript files (loadShard("2024-05", "<base64 gzip>")) so the
+    report still works when opened straight from disk, where fetch() is blocked.
+    """
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    manifest = []
+    
+    with tempfile.TemporaryDirectory() as spool_dir:
+        spool = MonthSpool(Path(spool_dir))
+        try:
+            for comment in comments:
+                spool.add(shard_key(comment), comment)
+        finally:
+            spool.close()
+        
+        for month in sorted(spool.counts, reverse=True):
+            with tempfile.TemporaryFile() as packed:
+                with gzip.open(packed, 'wt', encoding='utf-8', compresslevel=6) as f:
+                    shard = ShardWriter(f)
+                    for comment in spool.iter_month(month):
+                        shard.add(comment)
+                    shard.finish()
+                
+                packed.seek(0)
+                with open(shard_dir / f'{month}.js', 'w', encoding='ascii') as f:
+                    f.write(f'loadShard({json.dumps(month)}, "')
+                    # Chunks of a multiple of 3 bytes encode to base64 without padding in between
+                    for chunk in iter(lambda: packed.read(3 * 65536), b''):
+                        f.write(base64.b64encode(chunk).decode('ascii'))
+                    f.write('");\n')
+            
+            manifest.append({
+                'id': month,
+                'file': f'{shard_dir.name}/{month}.js',
+                'count': shard.count,
+                'from': shard.time_from,
+                'to': shard.time_to,
+                'videos': sorted(shard.video_ids)
+            })
+    return manifest
+
+
+def generate_html_report(json_file: str, output_file: str = None, sharded: bool = False):
 
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            comments = json.load(f)
+        # Json or Json Lines, plain, gzip or zstd compressed, flat or normalized; read as a stream
+        comments, videos, _ = iter_report(json_file)
+        first = next(comments, None)
     except FileNotFoundError:
         print(f"❌ File Not Found: {json_file}")
         return
-    except json.JSONDecodeError:
-        print(f"❌ Error Parsing Json: {json_file}")
+    except (json.JSONDecodeError, EOFError, OSError) as e:
+        print(f"❌ Error Parsing Json: {json_file} ({e})")
+        return
+    except RuntimeError as e:
+        print(f"❌ {e}")
         return
     
-    if not comments:
+    if first is None:
         print("❌ No Comments Found In Json File")
         return
     
@@ -25,17 +292,20 @@ def generate_html_report(json_file: str, output_file: str = None):
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         output_file = f'youtube_comments_report_{timestamp}.html'
     
-    total_comments = len(comments)
-    unique_authors = sorted(set(c['author'] for c in comments))
-    unique_videos = len(set(c['video_id'] for c in comments))
-    total_likes = sum(c['like_count'] for c in comments)
-    replies_count = sum(1 for c in comments if c['is_reply'])
-    top_level_count = total_comments - replies_count
+    stats = ReportStats()
+    comments = stats.counted(chain([first], comments))
     
-    comments_json = json.dumps(comments, ensure_ascii=False)
-    authors_json = json.dumps(unique_authors, ensure_ascii=False)
+    page_size = REPORT_PAGE_SIZE
+    author_suggestions = AUTHOR_SUGGESTIONS
+    month_filter = '' if not sharded else """
+                <div class="filter-group">
+                    <label for="shardMonth">Month</label>
+                    <select id="shardMonth" onchange="applyFilters()"></select>
+                </div>"""
     
-    html_content = f"""<!DOCTYPE html>
+    # The page is written in three parts: markup, the comment data streamed straight
+    # from the input, then the script, which gets the numbers gathered along the way
+    header_html = f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -357,6 +627,33 @@ def generate_html_report(json_file: str, output_file: str = None):
             color: #b0b0b0;
         }}
         
+        .pagination {{
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            gap: 10px;
+            margin: 20px 0;
+            flex-wrap: wrap;
+        }}
+        
+        .pagination:empty {{
+            display: none;
+        }}
+        
+        .pagination .btn:disabled {{
+            opacity: 0.4;
+            cursor: default;
+        }}
+        
+        .page-info {{
+            color: #b0b0b0;
+            padding: 0 10px;
+        }}
+        
+        .page-info strong {{
+            color: #ffffff;
+        }}
+        
         .badge {{
             display: inline-block;
             padding: 4px 10px;
@@ -447,27 +744,27 @@ def generate_html_report(json_file: str, output_file: str = None):
         
         <div class="stats">
             <div class="stat-card">
-                <div class="number">{total_comments}</div>
+                <div class="number" id="statComments">-</div>
                 <div class="label">Total Comments</div>
             </div>
             <div class="stat-card">
-                <div class="number">{len(unique_authors)}</div>
+                <div class="number" id="statAuthors">-</div>
                 <div class="label">Unique Authors</div>
             </div>
             <div class="stat-card">
-                <div class="number">{unique_videos}</div>
+                <div class="number" id="statVideos">-</div>
                 <div class="label">Videos</div>
             </div>
             <div class="stat-card">
-                <div class="number">{total_likes}</div>
+                <div class="number" id="statLikes">-</div>
                 <div class="label">Total Likes</div>
             </div>
             <div class="stat-card">
-                <div class="number">{top_level_count}</div>
+                <div class="number" id="statTopLevel">-</div>
                 <div class="label">Main Comments</div>
             </div>
             <div class="stat-card">
-                <div class="number">{replies_count}</div>
+                <div class="number" id="statReplies">-</div>
                 <div class="label">Replies</div>
             </div>
         </div>
@@ -475,15 +772,15 @@ def generate_html_report(json_file: str, output_file: str = None):
         <div class="filters">
             <h2>🔍 Search Filters</h2>
             <div class="filter-grid">
+{month_filter}
                 <div class="filter-group">
                     <label for="searchText">Search Text</label>
                     <input type="text" id="searchText" placeholder="Keywords...">
                 </div>
                 <div class="filter-group">
                     <label for="searchAuthor">Search Author</label>
-                    <select id="searchAuthor">
-                        <option value="">All Authors</option>
-                    </select>
+                    <input type="text" id="searchAuthor" list="authorSuggestions" placeholder="All Authors..." autocomplete="off">
+                    <datalist id="authorSuggestions"></datalist>
                 </div>
                 <div class="filter-group">
                     <label for="searchVideo">Search Video</label>
@@ -534,27 +831,212 @@ def generate_html_report(json_file: str, output_file: str = None):
                     </select>
                 </div>
             </div>
+            <div class="pagination" id="paginationTop"></div>
             <div id="commentsContainer">
                 <div class="loading">Loading Comments...</div>
             </div>
+            <div class="pagination" id="paginationBottom"></div>
         </div>
     </div>
 
-    <script>
-        // Comments data
-        const allComments = {comments_json};
+"""
+    
+    try:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(header_html)
+            
+            # Comments data, split into shards: a single inline shard, or per-month files loaded on demand
+            f.write('    <script>\n        const inlineShards = ')
+            if sharded:
+                shard_dir = Path(output_file).with_name(Path(output_file).stem + '_data')
+                manifest = write_shards(comments, shard_dir)
+                f.write('{}')
+            else:
+                f.write('{"all":')
+                shard = ShardWriter(f)
+                for comment in comments:
+                    shard.add(comment)
+                shard.finish()
+                f.write('}')
+                manifest = [{'id': 'all', 'file': None, 'count': shard.count, 'from': None, 'to': None, 'videos': None}]
+            f.write(';\n    </script>\n')
+            
+            # Comments reference their video by id; titles live once in the videos table
+            manifest_json = script_json(manifest)
+            videos_json = script_json({video_id: video['title'] for video_id, video in videos.items()})
+            authors_json = script_json(sorted(stats.authors))
+            stats_json = script_json(stats.as_dict())
+            
+            f.write(f"""    <script>
+        const shardManifest = {manifest_json};
+        const videoTitles = {videos_json};
         const allAuthors = {authors_json};
-        let filteredComments = [...allComments];
-        
-        // Populate authors dropdown
-        function populateAuthorsDropdown() {{
-            const select = document.getElementById('searchAuthor');
-            allAuthors.forEach(author => {{
-                const option = document.createElement('option');
-                option.value = author;
-                option.textContent = author;
-                select.appendChild(option);
+        const reportStats = {stats_json};
+        
+        function videoTitle(comment) {{
+            return videoTitles[comment.video_id] || '';
+        }}
+        let filteredComments = [];
+        
+        // Only one page of cards is ever in the DOM, so rendering cost does not grow with the report
+        const PAGE_SIZE = {page_size};
+        let currentPage = 1;
+        
+        // Authors are only matched against while typing; at most a few suggestions are ever in the DOM
+        const AUTHOR_SUGGESTIONS = {author_suggestions};
+        const authorNames = new Set(allAuthors);
+        const lowerAuthors = allAuthors.map(author => author.toLowerCase());
+        
+        const lowerVideoTitles = Object.fromEntries(
+            Object.entries(videoTitles).map(([videoId, title]) => [videoId, (title || '').toLowerCase()])
+        );
+        const TOKEN_RE = /[\\p{{L}}\\p{{N}}_]+/gu;
+        const DAY_MS = 24 * 60 * 60 * 1000;
+        
+        const shards = new Map();
+        const pendingShards = new Map();
+        let filterRun = 0;
+        
+        // A shard carries its comments plus the search index precomputed by the generator:
+        // lowercased texts, epoch times and word -> comments
+        function prepareShard(id, data) {{
+            const search = data.search;
+            data.comments.forEach((comment, i) => {{
+                comment._time = search.times[i] ?? Date.parse(comment.published_at);
             }});
+            const shard = {{
+                id: id,
+                comments: data.comments,
+                texts: search.texts,
+                tokens: search.tokens,
+                vocabulary: Object.keys(search.tokens),
+                decoded: new Map()
+            }};
+            shards.set(id, shard);
+            return shard;
+        }}
+        
+        Object.entries(inlineShards).forEach(([id, data]) => prepareShard(id, data));
+        
+        // Called by every shard file: base64 gzip Json, unpacked in the browser
+        async function loadShard(id, encoded) {{
+            const pending = pendingShards.get(id);
+            try {{
+                const bytes = Uint8Array.from(atob(encoded), c => c.charCodeAt(0));
+                const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+                const shard = prepareShard(id, JSON.parse(await new Response(stream).text()));
+                if (pending) {{
+                    pending.resolve(shard);
+                }}
+            }} catch (error) {{
+                if (pending) {{
+                    pending.reject(error);
+                }}
+            }}
+        }}
+        
+        // Load a shard file once, however many filters ask for it
+        function requestShard(entry) {{
+            if (shards.has(entry.id)) {{
+                return Promise.resolve(shards.get(entry.id));
+            }}
+            if (!pendingShards.has(entry.id)) {{
+                const pending = {{}};
+                pending.promise = new Promise((resolve, reject) => {{
+                    pending.resolve = resolve;
+                    pending.reject = reject;
+                }});
+                pendingShards.set(entry.id, pending);
+                
+                const script = document.createElement('script');
+                script.src = entry.file;
+                script.onerror = () => pending.reject(new Error('Missing Data File: ' + entry.file));
+                document.body.appendChild(script);
+            }}
+            return pendingShards.get(entry.id).promise;
+        }}
+        
+        // Shards that can hold comments matching the month, date range and video filters
+        function selectShards(month, timeFrom, timeTo, searchVideo) {{
+            return shardManifest.filter(entry =>
+                (!month || entry.id === month) &&
+                (entry.to === null || entry.to >= timeFrom) &&
+                (entry.from === null || entry.from < timeTo) &&
+                (!searchVideo || !entry.videos ||
+                    entry.videos.some(videoId => (lowerVideoTitles[videoId] || '').includes(searchVideo)))
+            );
+        }}
+        
+        // Positions of the comments containing a word, decoded on first use
+        function postings(shard, token) {{
+            let positions = shard.decoded.get(token);
+            if (!positions) {{
+                positions = shard.tokens[token].slice();
+                for (let i = 1; i < positions.length; i++) {{
+                    positions[i] += positions[i - 1];
+                }}
+                shard.decoded.set(token, positions);
+            }}
+            return positions;
+        }}
+        
+        // Comments that can contain the search text: every word of the query must be part of
+        // one of their words. Returns null when the query has no words (scan everything)
+        function searchCandidates(shard, searchText) {{
+            const queryTokens = [...new Set(searchText.match(TOKEN_RE) || [])];
+            if (!queryTokens.length) {{
+                return null;
+            }}
+            
+            let candidates = null;
+            for (const queryToken of queryTokens) {{
+                const matches = new Set();
+                for (const token of shard.vocabulary) {{
+                    if (token.includes(queryToken)) {{
+                        for (const position of postings(shard, token)) {{
+                            matches.add(position);
+                        }}
+                    }}
+                }}
+                candidates = candidates ? candidates.filter(position => matches.has(position)) : [...matches];
+                if (!candidates.length) {{
+                    break;
+                }}
+            }}
+            return candidates.sort((a, b) => a - b);
+        }}
+        
+        // Fill in the header numbers
+        function renderStats() {{
+            Object.entries(reportStats).forEach(([id, value]) => {{
+                document.getElementById(id).textContent = value;
+            }});
+        }}
+        
+        // Populate months dropdown (sharded reports only)
+        function populateMonthsDropdown() {{
+            const select = document.getElementById('shardMonth');
+            if (!select) {{
+                return;
+            }}
+            const total = shardManifest.reduce((sum, entry) => sum + entry.count, 0);
+            select.innerHTML = [`<option value="">All Months (${{total}} Comments)</option>`]
+                .concat(shardManifest.map(entry => `<option value="${{entry.id}}">${{entry.id}} (${{entry.count}} Comments)</option>`))
+                .join('');
+        }}
+        
+        // Suggest the first authors matching what was typed
+        function suggestAuthors() {{
+            const typed = document.getElementById('searchAuthor').value.toLowerCase();
+            const options = [];
+            for (let i = 0; typed && i < lowerAuthors.length && options.length < AUTHOR_SUGGESTIONS; i++) {{
+                if (lowerAuthors[i].includes(typed)) {{
+                    const option = document.createElement('option');
+                    option.value = allAuthors[i];
+                    options.push(option);
+                }}
+            }}
+            document.getElementById('authorSuggestions').replaceChildren(...options);
         }}
         
         // Format date
@@ -570,72 +1052,106 @@ def generate_html_report(json_file: str, output_file: str = None):
         }}
         
         // Apply filters
-        function applyFilters() {{
+        async function applyFilters() {{
+            const run = ++filterRun;
             const searchText = document.getElementById('searchText').value.toLowerCase();
+            // A picked name matches exactly, anything else typed matches part of the name
             const searchAuthor = document.getElementById('searchAuthor').value;
+            const exactAuthor = authorNames.has(searchAuthor);
+            const lowerSearchAuthor = searchAuthor.toLowerCase();
             const searchVideo = document.getElementById('searchVideo').value.toLowerCase();
             const dateFrom = document.getElementById('dateFrom').value;
             const dateTo = document.getElementById('dateTo').value;
             const minLikes = parseInt(document.getElementById('minLikes').value) || 0;
             const commentType = document.getElementById('commentType').value;
             const sortBy = document.getElementById('sortBy').value;
+            const monthSelect = document.getElementById('shardMonth');
+            const month = monthSelect ? monthSelect.value : '';
             
-            // Filter
-            filteredComments = allComments.filter(comment => {{
-                // Text filter
-                if (searchText && !comment.text.toLowerCase().includes(searchText)) {{
-                    return false;
+            const timeFrom = dateFrom ? Date.parse(dateFrom) : -Infinity;
+            const timeTo = dateTo ? Date.parse(dateTo) + DAY_MS : Infinity;
+            
+            // Load whatever shards the filters need that are not loaded yet
+            const entries = selectShards(month, timeFrom, timeTo, searchVideo);
+            const missing = entries.filter(entry => !shards.has(entry.id));
+            if (missing.length) {{
+                const container = document.getElementById('commentsContainer');
+                const count = missing.reduce((total, entry) => total + entry.count, 0);
+                container.innerHTML = `<div class="loading">Loading ${{count}} Comments...</div>`;
+                try {{
+                    await Promise.all(missing.map(requestShard));
+                }} catch (error) {{
+                    container.innerHTML = `
+                        <div class="no-results">
+                            <h3>⚠️ Comments Could Not Be Loaded</h3>
+                            <p>${{error.message}}</p>
+                        </div>
+                    `;
+                    return;
                 }}
-                
-                // Author filter
-                if (searchAuthor && comment.author !== searchAuthor) {{
-                    return false;
+                if (run !== filterRun) {{
+                    // A newer filter change has taken over
+                    return;
                 }}
+            }}
+            
+            // Filter
+            const results = [];
+            for (const entry of entries) {{
+                const shard = shards.get(entry.id);
                 
-                // Video filter
-                if (searchVideo && !comment.video_title.toLowerCase().includes(searchVideo)) {{
-                    return false;
-                }}
+                // Text filter: only the comments the index says can match are checked
+                const candidates = searchText ? searchCandidates(shard, searchText) : null;
+                const positions = candidates || shard.comments.keys();
                 
-                // Date from filter
-                if (dateFrom) {{
-                    const commentDate = new Date(comment.published_at).toISOString().split('T')[0];
-                    if (commentDate < dateFrom) {{
-                        return false;
+                for (const position of positions) {{
+                    const comment = shard.comments[position];
+                    
+                    // Text filter
+                    if (searchText && !shard.texts[position].includes(searchText)) {{
+                        continue;
                     }}
-                }}
-                
-                // Date to filter
-                if (dateTo) {{
-                    const commentDate = new Date(comment.published_at).toISOString().split('T')[0];
-                    if (commentDate > dateTo) {{
-                        return false;
+                    
+                    // Author filter
+                    if (searchAuthor && (exactAuthor ? comment.author !== searchAuthor
+                            : !(comment.author || '').toLowerCase().includes(lowerSearchAuthor))) {{
+                        continue;
                     }}
+                    
+                    // Video filter
+                    if (searchVideo && !(lowerVideoTitles[comment.video_id] || '').includes(searchVideo)) {{
+                        continue;
+                    }}
+                    
+                    // Date range filter
+                    if (comment._time < timeFrom || comment._time >= timeTo) {{
+                        continue;
+                    }}
+                    
+                    // Likes filter
+                    if (comment.like_count < minLikes) {{
+                        continue;
+                    }}
+                    
+                    // Type filter
+                    if (commentType === 'top' && comment.is_reply) {{
+                        continue;
+                    }}
+                    if (commentType === 'replies' && !comment.is_reply) {{
+                        continue;
+                    }}
+                    
+                    results.push(comment);
                 }}
-                
-                // Likes filter
-                if (comment.like_count < minLikes) {{
-                    return false;
-                }}
-                
-                // Type filter
-                if (commentType === 'top' && comment.is_reply) {{
-                    return false;
-                }}
-                if (commentType === 'replies' && !comment.is_reply) {{
-                    return false;
-                }}
-                
-                return true;
-            }});
+            }}
             
             // Sort
-            filteredComments.sort((a, b) => {{
+            results.sort((a, b) => {{
                 switch(sortBy) {{
                     case 'date_desc':
-                        return new Date(b.published_at) - new Date(a.published_at);
+                        return b._time - a._time;
                     case 'date_asc':
-                        return new Date(a.published_at) - new Date(b.published_at);
+                        return a._time - b._time;
                     case 'likes_desc':
                         return b.like_count - a.like_count;
                     case 'likes_asc':
@@ -648,7 +1164,9 @@ def generate_html_report(json_file: str, output_file: str = None):
                         return 0;
                 }}
             }});
+            filteredComments = results;
             
+            currentPage = 1;
             renderComments();
         }}
         
@@ -662,9 +1180,18 @@ def generate_html_report(json_file: str, output_file: str = None):
             document.getElementById('minLikes').value = '';
             document.getElementById('commentType').value = 'all';
             document.getElementById('sortBy').value = 'date_desc';
+            resetMonth();
             applyFilters();
         }}
         
+        // A sharded report opens on its newest month, so only that shard is loaded up front
+        function resetMonth() {{
+            const monthSelect = document.getElementById('shardMonth');
+            if (monthSelect) {{
+                monthSelect.value = shardManifest.length ? shardManifest[0].id : '';
+            }}
+        }}
+        
         // Render comments
         function renderComments() {{
             const container = document.getElementById('commentsContainer');
@@ -679,10 +1206,15 @@ def generate_html_report(json_file: str, output_file: str = None):
                         <p>Try Modifying The Search Filters</p>
                     </div>
                 `;
+                renderPagination(0);
                 return;
             }}
             
-            const html = filteredComments.map(comment => `
+            const totalPages = Math.ceil(filteredComments.length / PAGE_SIZE);
+            currentPage = Math.min(Math.max(currentPage, 1), totalPages);
+            const start = (currentPage - 1) * PAGE_SIZE;
+            
+            const html = filteredComments.slice(start, start + PAGE_SIZE).map(comment => `
                 <div class="comment-card ${{comment.is_reply ? 'reply' : ''}}">
                     <div class="comment-header">
                         <div>
@@ -704,12 +1236,33 @@ def generate_html_report(json_file: str, output_file: str = None):
                     </div>
                     <div class="comment-text">${{comment.text}}</div>
                     <div class="comment-video">
-                        <strong>Video:</strong> ${{comment.video_title}}
+                        <strong>Video:</strong> ${{videoTitle(comment)}}
                     </div>
                 </div>
             `).join('');
             
             container.innerHTML = html;
+            renderPagination(totalPages);
+        }}
+        
+        // Render page controls above and below the results
+        function renderPagination(totalPages) {{
+            const html = totalPages <= 1 ? '' : `
+                <button class="btn btn-secondary" onclick="goToPage(1)" ${{currentPage === 1 ? 'disabled' : ''}}>⏮ First</button>
+                <button class="btn btn-secondary" onclick="goToPage(${{currentPage - 1}})" ${{currentPage === 1 ? 'disabled' : ''}}>◀ Previous</button>
+                <span class="page-info">Page <strong>${{currentPage}}</strong> Of <strong>${{totalPages}}</strong></span>
+                <button class="btn btn-secondary" onclick="goToPage(${{currentPage + 1}})" ${{currentPage === totalPages ? 'disabled' : ''}}>Next ▶</button>
+                <button class="btn btn-secondary" onclick="goToPage(${{totalPages}})" ${{currentPage === totalPages ? 'disabled' : ''}}>Last ⏭</button>
+            `;
+            document.getElementById('paginationTop').innerHTML = html;
+            document.getElementById('paginationBottom').innerHTML = html;
+        }}
+        
+        // Jump to a page of results
+        function goToPage(page) {{
+            currentPage = page;
+            renderComments();
+            document.querySelector('.results').scrollIntoView();
         }}
         
         // Export to CSV
@@ -721,7 +1274,7 @@ def generate_html_report(json_file: str, output_file: str = None):
                     c.text.replace(/"/g, '""'),
                     c.like_count,
                     c.published_at,
-                    c.video_title.replace(/"/g, '""'),
+                    videoTitle(c).replace(/"/g, '""'),
                     c.is_reply ? 'Reply' : 'Comment'
                 ])
             ].map(row => row.map(cell => `"${{cell}}"`).join(',')).join('\\n');
@@ -735,14 +1288,17 @@ def generate_html_report(json_file: str, output_file: str = None):
         
         // Load initially
         window.onload = function() {{
-            populateAuthorsDropdown();
+            renderStats();
+            populateMonthsDropdown();
+            resetMonth();
             applyFilters();
         }};
         
         // Auto-apply filters when typing
         document.getElementById('searchText').addEventListener('input', debounce(applyFilters, 500));
         document.getElementById('searchVideo').addEventListener('input', debounce(applyFilters, 500));
-        document.getElementById('searchAuthor').addEventListener('change', applyFilters);
+        document.getElementById('searchAuthor').addEventListener('input', debounce(suggestAuthors, 200));
+        document.getElementById('searchAuthor').addEventListener('input', debounce(applyFilters, 500));
         
         // Debounce function
         function debounce(func, wait) {{
@@ -759,20 +1315,18 @@ def generate_html_report(json_file: str, output_file: str = None):
     </script>
 </body>
 </html>
-"""
-    
-    try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        print(f"✅ Html Saved: {output_file}")
-        print(f"\n📊 Comments Included: {total_comments}")
-        
-        return output_file
-        
+""")
+    except (json.JSONDecodeError, EOFError) as e:
+        print(f"❌ Error Parsing Json: {json_file} ({e})")
+        return None
     except Exception as e:
         print(f"❌ Error Saving Html File: {e}")
         return None
+    
+    print(f"✅ Html Saved: {output_file}")
+    print(f"\n📊 Comments Included: {stats.comments}")
+    
+    return output_file
 
 
 def main():
@@ -783,8 +1337,12 @@ def main():
     print("Youtube Comments Html Report Generator")
     print("="*60)
     
-    if len(sys.argv) > 1:
-        json_file = sys.argv[1]
+    # --sharded writes the comments as per-month data files loaded on demand
+    args = [arg for arg in sys.argv[1:] if arg != '--sharded']
+    sharded = '--sharded' in sys.argv[1:]
+    
+    if args:
+        json_file = args[0]
     else:
         json_file = input("\nEnter Path To Json File With Comments: ").strip()
     
@@ -803,7 +1361,7 @@ def main():
     else:
         output_file = None
     
-    generate_html_report(json_file, output_file)
+    generate_html_report(json_file, output_file, sharded)
 
 
 if __name__ == '__main__':
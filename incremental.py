@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+import json
+from pathlib import Path
+from typing import List, Dict, Optional
+
+from report_io import iter_comments, comment_files
+
+
+class IncrementalState:
+    """
+    What previous runs already downloaded for a channel, used by --incremental.
+
+    Per video it keeps the newest top-level comment timestamp (plus the ids
+    sharing that timestamp) and the commentCount seen at the last run. The
+    comments of this run only count once their video is complete, so a video
+    left unfinished is paged through again instead of being skipped as known.
+    """
+
+    def __init__(self, channel_dir: Path):
+        self.path = Path(channel_dir) / 'incremental_state.json'
+        self.videos: Dict[str, Dict] = {}
+        self._pending: Dict[str, Dict] = {}
+
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.videos = json.load(f)
+        else:
+            self._load_previous_outputs(Path(channel_dir))
+
+    def _load_previous_outputs(self, channel_dir: Path):
+        for json_file in comment_files(channel_dir):
+            for comment in iter_comments(json_file):
+                self._add_marks(self.videos, comment)
+        if self.videos:
+            print(f"Loaded Previous Comments For {len(self.videos)} Videos")
+
+    @staticmethod
+    def _video_in(videos: Dict[str, Dict], video_id: str) -> Dict:
+        return videos.setdefault(video_id, {
+            'comment_count': None,
+            'latest_published_at': None,
+            'latest_ids': []
+        })
+
+    def comment_count(self, video_id: str) -> Optional[int]:
+        return self.videos.get(video_id, {}).get('comment_count')
+
+    def is_known(self, video_id: str, comment_id: str, published_at: str) -> bool:
+        video = self.videos.get(video_id)
+        if not video or not video['latest_published_at']:
+            return False
+        # ISO 8601 UTC timestamps compare correctly as strings
+        if published_at < video['latest_published_at']:
+            return True
+        return published_at == video['latest_published_at'] and comment_id in video['latest_ids']
+
+    def _add_marks(self, videos: Dict[str, Dict], comment: Dict):
+        if comment['is_reply']:
+            return
+        video = self._video_in(videos, comment['video_id'])
+        latest = video['latest_published_at']
+        if latest is None or comment['published_at'] > latest:
+            video['latest_published_at'] = comment['published_at']
+            video['latest_ids'] = [comment['comment_id']]
+        elif comment['published_at'] == latest and comment['comment_id'] not in video['latest_ids']:
+            video['latest_ids'].append(comment['comment_id'])
+
+    def add_comments(self, comments: List[Dict]):
+        # Held back until complete_video: the pages of a video come newest first, so the
+        # comments after its first page are not known yet
+        for comment in comments:
+            self._add_marks(self._pending, comment)
+
+    def complete_video(self, video_id: str, comment_count: Optional[int]):
+        video = self._video_in(self.videos, video_id)
+        pending = self._pending.pop(video_id, None)
+        if pending:
+            for comment_id in pending['latest_ids']:
+                self._add_marks(self.videos, {
+                    'video_id': video_id, 'comment_id': comment_id, 'is_reply': False,
+                    'published_at': pending['latest_published_at']
+                })
+        video['comment_count'] = comment_count
+
+    def save(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.videos, f, ensure_ascii=False)
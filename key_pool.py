@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+import hashlib
+import threading
+from collections import defaultdict
+from typing import List, Dict, Union
+
+from api_model import build_client
+from response_cache import ResponseCache, CachingHttp
+from transport import Httplib2Transport
+
+
+class ApiKeyPool:
+    """
+    Round-robin pool of Api keys with one client per key.
+
+    A key that hits its daily quota is retired for the rest of the day,
+    and requests keep flowing through the remaining keys.
+    """
+
+    def __init__(self, api_keys: Union[str, List[str]], cache: ResponseCache = None, transport=None):
+        if isinstance(api_keys, str):
+            api_keys = [api_keys]
+        self.api_keys = list(dict.fromkeys(key.strip() for key in api_keys if key.strip()))
+        if not self.api_keys:
+            raise ValueError("At Least One Api Key Is Required")
+
+        self.cache = cache
+        self.transport = transport or Httplib2Transport()
+        self.retired: Dict[str, str] = {}
+        self.requests: Dict[str, int] = defaultdict(int)
+        self.units: Dict[str, int] = defaultdict(int)
+        self._next = 0
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_id(api_key: str) -> str:
+        # Stable short id so keys never end up in logs or state files
+        return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:10]
+
+    @property
+    def active_keys(self) -> List[str]:
+        return [key for key in self.api_keys if key not in self.retired]
+
+    def next_key(self) -> str:
+        with self._lock:
+            active = self.active_keys
+            if not active:
+                return None
+            key = active[self._next % len(active)]
+            self._next += 1
+            return key
+
+    def client(self, api_key: str):
+        # Built once and shared by all threads: the transport handles concurrent requests
+        with self._lock:
+            if api_key not in self._clients:
+                http = self.transport
+                if self.cache:
+                    http = CachingHttp(http, self.cache)
+                self._clients[api_key] = build_client(api_key, http)
+            return self._clients[api_key]
+
+    def record(self, api_key: str, cost: int):
+        with self._lock:
+            self.requests[api_key] += 1
+            self.units[api_key] += cost
+
+    def retire(self, api_key: str, reason: str):
+        with self._lock:
+            if api_key in self.retired:
+                return
+            self.retired[api_key] = reason
+        print(f"\n🔑 Api Key {self.key_id(api_key)} Retired For Today ({reason}) - "
+              f"{len(self.active_keys)} Keys Left")
+
+    def reactivate(self):
+        with self._lock:
+            self.retired.clear()
+
+    def usage(self) -> List[Dict]:
+        return [{
+            'key_id': self.key_id(key),
+            'requests': self.requests.get(key, 0),
+            'units': self.units.get(key, 0),
+            'retired': self.retired.get(key)
+        } for key in self.api_keys]
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+ROW_GROUP_SIZE = 100_000
+
+# Repeated values (one video title per thousands of comments) are stored once per row group
+DICTIONARY_COLUMNS = ['video_id', 'author', 'video_title', 'channel_name']
+TIMESTAMP_COLUMNS = ['published_at', 'updated_at', 'video_published_at']
+
+
+def parquet_available() -> bool:
+    return pa is not None
+
+
+def comment_schema():
+    text = pa.string()
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    timestamp = pa.timestamp('ms', tz='UTC')
+    return pa.schema([
+        ('video_id', dictionary),
+        ('comment_id', text),
+        ('author', dictionary),
+        ('author_channel_id', text),
+        ('text', text),
+        ('like_count', pa.int64()),
+        ('published_at', timestamp),
+        ('updated_at', timestamp),
+        ('is_reply', pa.bool_()),
+        ('parent_id', text),
+        ('video_title', dictionary),
+        ('video_published_at', timestamp),
+        ('channel_name', dictionary),
+    ])
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    # Api timestamps are ISO 8601 in UTC, e.g. 2024-02-01T12:00:00Z
+    return datetime.fromisoformat(value.replace('Z', '+00:00')) if value else None
+
+
+class ParquetReportWriter:
+    """
+    Columnar export of the comments with a fixed schema, for pandas / Arrow / DuckDB.
+
+    Comments are buffered and written one row group at a time, so memory use
+    is bounded by ROW_GROUP_SIZE rather than by the size of the channel.
+    """
+
+    def __init__(self, path: Path, row_group_size: int = ROW_GROUP_SIZE):
+        if pa is None:
+            raise RuntimeError("Parquet Export Needs The pyarrow Package (pip install pyarrow)")
+        self.path = Path(path)
+        self.row_group_size = row_group_size
+        self.schema = comment_schema()
+        self._rows: List[Dict] = []
+        self._writer = pq.ParquetWriter(str(self.path), self.schema, compression='zstd',
+                                        use_dictionary=DICTIONARY_COLUMNS)
+
+    def write(self, comments: List[Dict]):
+        self._rows.extend(comments)
+        while len(self._rows) >= self.row_group_size:
+            self._write_row_group(self._rows[:self.row_group_size])
+            del self._rows[:self.row_group_size]
+
+    def _write_row_group(self, rows: List[Dict]):
+        columns = []
+        for field in self.schema:
+            values = [row.get(field.name) for row in rows]
+            if field.name in TIMESTAMP_COLUMNS:
+                values = [_parse_timestamp(value) for value in values]
+            if field.name in DICTIONARY_COLUMNS:
+                columns.append(pa.array(values, type=pa.string()).dictionary_encode())
+            else:
+                columns.append(pa.array(values, type=field.type))
+        self._writer.write_table(pa.Table.from_arrays(columns, schema=self.schema))
+
+    def abort(self):
+        self._writer.close()
+
+    def close(self):
+        if self._rows:
+            self._write_row_group(self._rows)
+            self._rows = []
+        self._writer.close()
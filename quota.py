@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Optional, Callable
+
+from googleapiclient.errors import HttpError
+
+from key_pool import ApiKeyPool
+from retry import RetryPolicy, classify_error, QUOTA
+
+try:
+    from zoneinfo import ZoneInfo
+    QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')
+except Exception:
+    QUOTA_TIMEZONE = timezone.utc
+
+DEFAULT_DAILY_BUDGET = 10000
+DEFAULT_RESERVE = 100
+# Spending is written to the state file at most this often (seconds), and on exit
+SAVE_INTERVAL = 1.0
+
+# Units per call, see https://developers.google.com/youtube/v3/determine_quota_cost
+METHOD_COSTS = {
+    'youtube.search.list': 100,
+}
+DEFAULT_METHOD_COST = 1
+
+
+class QuotaBudgetExhausted(Exception):
+    pass
+
+
+class QuotaScheduler:
+    """
+    Single gate for every YouTube Data Api call.
+
+    Picks an Api key from the pool, charges each request against that key's
+    daily budget (persisted per Pacific day, when Google resets quotas),
+    spaces requests to the target QPS, retries transient failures and keeps
+    per-channel and per-video unit counters. Retried attempts are charged
+    too, as Google bills them.
+    """
+
+    def __init__(self, daily_budget: int = DEFAULT_DAILY_BUDGET, qps: float = None,
+                 reserve: int = DEFAULT_RESERVE, wait_for_reset: bool = False,
+                 state_file: Path = Path('reports') / '.quota_usage.json', retry: RetryPolicy = None):
+        self.daily_budget = daily_budget
+        self.retry = retry or RetryPolicy()
+        self.reserve = reserve
+        self.wait_for_reset = wait_for_reset
+        self.state_file = Path(state_file)
+        self._interval = 1.0 / qps if qps else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+        self.channel_units: Dict[str, int] = defaultdict(int)
+        self.video_units: Dict[str, int] = defaultdict(int)
+        self._day = self._today()
+        self.key_spent: Dict[str, int] = defaultdict(int, self._load_spent())
+        self._saved_at = time.monotonic()
+        self._unsaved = False
+        atexit.register(self.flush)
+
+    def _today(self) -> str:
+        return datetime.now(QUOTA_TIMEZONE).strftime('%Y-%m-%d')
+
+    def _load_spent(self) -> Dict[str, int]:
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        spent = state.get('spent')
+        return spent if state.get('day') == self._day and isinstance(spent, dict) else {}
+
+    def _save_spent(self):
+        # Written to a temporary file and swapped in, so a crash mid-write never leaves
+        # a truncated file that would reset the day's spending to 0
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.state_file.parent, prefix=self.state_file.name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'day': self._day, 'spent': self.key_spent}, f)
+            os.replace(temp_path, self.state_file)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self._saved_at = time.monotonic()
+        self._unsaved = False
+
+    def flush(self):
+        with self._lock:
+            if self._unsaved:
+                self._save_spent()
+
+    def seconds_until_reset(self) -> float:
+        now = datetime.now(QUOTA_TIMEZONE)
+        midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        return (midnight - now).total_seconds()
+
+    @property
+    def spent_today(self) -> int:
+        return sum(self.key_spent.values())
+
+    def cost_of(self, request, keys: ApiKeyPool = None) -> int:
+        # Responses served from the local cache never reach Google, so they are free
+        if keys and keys.cache and (keys.cache.offline or keys.cache.contains(request.uri)):
+            return 0
+        return METHOD_COSTS.get(getattr(request, 'methodId', None), DEFAULT_METHOD_COST)
+
+    def _start_new_day(self, keys: ApiKeyPool):
+        if self._today() != self._day:
+            self._day = self._today()
+            self.key_spent.clear()
+            self._save_spent()
+            keys.reactivate()
+
+    def charge(self, keys: ApiKeyPool, api_key: str, cost: int,
+               channel_id: str = None, video_id: str = None) -> bool:
+        key_id = keys.key_id(api_key)
+        if not cost:
+            return True
+
+        with self._lock:
+            self._start_new_day(keys)
+
+            if self.key_spent[key_id] + cost > self.daily_budget - self.reserve:
+                if self._unsaved:
+                    self._save_spent()
+                return False
+
+            self.key_spent[key_id] += cost
+            if channel_id:
+                self.channel_units[channel_id] += cost
+            if video_id:
+                self.video_units[video_id] += cost
+            self._unsaved = True
+            if time.monotonic() - self._saved_at >= SAVE_INTERVAL:
+                self._save_spent()
+            keys.record(api_key, cost)
+
+            # Reserve the next send slot so concurrent workers share the QPS target
+            now = time.monotonic()
+            delay = max(0.0, self._next_slot - now)
+            self._next_slot = max(now, self._next_slot) + self._interval
+
+        if delay:
+            time.sleep(delay)
+        return True
+
+    def _out_of_keys(self, keys: ApiKeyPool):
+        if not self.wait_for_reset:
+            raise QuotaBudgetExhausted(
+                f"Daily Quota Budget Nearly Used Up On All {len(keys.api_keys)} Api Keys "
+                f"({self.spent_today}/{self.daily_budget * len(keys.api_keys)} Units)"
+            )
+
+        wait = self.seconds_until_reset()
+        print(f"\n⏸️ Quota Budget Reached - Waiting {wait / 3600:.1f} Hours For The Daily Reset")
+        time.sleep(wait + 5)
+        with self._lock:
+            self._start_new_day(keys)
+
+    def execute(self, make_request: Callable, keys: ApiKeyPool,
+                channel_id: str = None, video_id: str = None) -> Dict:
+        method = ['Api Request']
+
+        def attempt():
+            while True:
+                api_key = keys.next_key()
+                if api_key is None:
+                    self._out_of_keys(keys)
+                    continue
+
+                request = make_request(keys.client(api_key))
+                method[0] = getattr(request, 'methodId', method[0])
+                if not self.charge(keys, api_key, self.cost_of(request, keys), channel_id, video_id):
+                    keys.retire(api_key, 'Budget Reached')
+                    continue
+
+                try:
+                    return request.execute()
+                except HttpError as e:
+                    if classify_error(e) != QUOTA:
+                        raise
+                    keys.retire(api_key, 'quotaExceeded')
+
+        return self.retry.call(attempt, lambda: method[0])
+
+    def usage(self, channel_id: str, video_ids, keys: ApiKeyPool = None) -> Dict:
+        usage = {
+            'day': self._day,
+            'spent_today': self.spent_today,
+            'daily_budget_per_key': self.daily_budget,
+            'channel_units': self.channel_units.get(channel_id, 0),
+            'video_units': {vid: self.video_units[vid] for vid in video_ids if self.video_units.get(vid)}
+        }
+        if keys:
+            usage['keys'] = keys.usage()
+        return usage
+
+    def print_usage(self, channel_id: str, video_titles: Optional[Dict[str, str]] = None,
+                    keys: ApiKeyPool = None, top: int = 5):
+        key_count = len(keys.api_keys) if keys else 1
+        print(f"\nQuota Units Used For Channel: {self.channel_units.get(channel_id, 0)}")
+        print(f"Quota Units Used Today: {self.spent_today}/{self.daily_budget * key_count}")
+
+        if keys and key_count > 1:
+            for key in keys.usage():
+                status = f" (Retired: {key['retired']})" if key['retired'] else ''
+                print(f"  🔑 {key['key_id']}: {key['requests']} Requests, {key['units']} Units{status}")
+
+        if video_titles:
+            costly = sorted(
+                (vid for vid in video_titles if self.video_units.get(vid)),
+                key=lambda vid: self.video_units[vid], reverse=True
+            )[:top]
+            for vid in costly:
+                print(f"  -> {self.video_units[vid]} Units: {video_titles[vid]}")
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+
+import gzip
+import json
+from pathlib import Path
+from typing import List, Dict, Iterator, Tuple, Union
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+OUTPUT_FORMATS = ['jsonl', 'json']
+COMPRESSIONS = {'none': '', 'gzip': '.gz', 'zstd': '.zst'}
+
+METADATA_SUFFIX = '.meta.json'
+
+# Per-video and per-channel fields that the flat layout repeats on every comment
+VIDEO_FIELDS = {'video_title': 'title', 'video_published_at': 'published_at'}
+CHANNEL_FIELDS = {'channel_name': 'title'}
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+
+def zstd_available() -> bool:
+    return zstandard is not None
+
+
+def _require_zstd():
+    if zstandard is None:
+        raise RuntimeError("Zstd Compression Needs The zstandard Package (pip install zstandard)")
+
+
+def detect_compression(path: Union[str, Path]) -> str:
+    # Trust the suffix, but sniff the magic bytes so renamed files still open
+    path = Path(path)
+    for compression, suffix in COMPRESSIONS.items():
+        if suffix and path.name.endswith(suffix):
+            return compression
+    with open(path, 'rb') as f:
+        head = f.read(4)
+    if head.startswith(GZIP_MAGIC):
+        return 'gzip'
+    if head.startswith(ZSTD_MAGIC):
+        return 'zstd'
+    return 'none'
+
+
+def strip_compression_suffix(path: Union[str, Path]) -> str:
+    name = str(path)
+    for suffix in COMPRESSIONS.values():
+        if suffix and name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def open_text(path: Union[str, Path], mode: str = 'r', compression: str = None, newline: str = None):
+    """
+    Open a report for text reading or writing, compressed or not.
+
+    When reading, compression is detected from the file itself.
+    """
+    if compression is None:
+        compression = detect_compression(path) if 'r' in mode else 'none'
+
+    if compression == 'gzip':
+        # A low level keeps gzip close to plain write speed while still shrinking Json about 5x
+        return gzip.open(path, mode + 't', compresslevel=5, encoding='utf-8', newline=newline)
+    if compression == 'zstd':
+        _require_zstd()
+        return zstandard.open(path, mode + 't', cctx=zstandard.ZstdCompressor(level=3),
+                              encoding='utf-8', newline=newline)
+    return open(path, mode, encoding='utf-8', newline=newline)
+
+
+def metadata_path(path: Union[str, Path]) -> Path:
+    # youtube_comments_TS.jsonl.gz -> youtube_comments_TS.meta.json
+    stem = strip_compression_suffix(path)
+    for suffix in ('.jsonl', '.json', '.csv'):
+        if stem.endswith(suffix):
+            stem = stem[:-len(suffix)]
+            break
+    return Path(stem + METADATA_SUFFIX)
+
+
+def comment_files(channel_dir: Path) -> List[Path]:
+    return sorted(
+        path for path in Path(channel_dir).glob('youtube_comments_*.json*')
+        if not path.name.endswith(METADATA_SUFFIX)
+    )
+
+
+def _iter_json_array(f, chunk_size: int = 1 << 20) -> Iterator[Dict]:
+    # Decodes a Json array one element at a time, so it never has to be in memory whole
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    started = False
+    eof = False
+
+    while True:
+        while position < len(buffer) and buffer[position] in ' \t\r\n,':
+            position += 1
+        if position < len(buffer):
+            if not started:
+                if buffer[position] != '[':
+                    raise json.JSONDecodeError("Expecting '['", buffer, position)
+                started = True
+                position += 1
+                continue
+            if buffer[position] == ']':
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # The item may end exactly at the buffer edge with more of a number still to come
+                if end < len(buffer) or eof:
+                    yield item
+                    position = end
+                    continue
+        elif eof:
+            raise json.JSONDecodeError('Unterminated Json array', buffer, position)
+
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+def iter_comments(path: Union[str, Path]) -> Iterator[Dict]:
+    # Json Lines are streamed line by line, a Json array element by element
+    with open_text(path) as f:
+        if strip_compression_suffix(path).endswith('.jsonl'):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from _iter_json_array(f)
+
+
+def load_comments(path: Union[str, Path]) -> List[Dict]:
+    return list(iter_comments(path))
+
+
+def iter_report(path: Union[str, Path]) -> Tuple[Iterator[Dict], Dict[str, Dict], Dict]:
+    """
+    Stream a report as (comments, videos by id, channel) whatever its layout.
+
+    Normalized reports come with a .meta.json holding the channel and videos;
+    for flat reports the per-video fields are lifted off the comments instead,
+    so videos and channel are only complete once the comments are consumed.
+    """
+    meta_file = metadata_path(path)
+    if meta_file.exists():
+        with open(meta_file, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+        videos = {video['video_id']: video for video in metadata['videos']}
+        return iter_comments(path), videos, metadata['channel']
+
+    videos, channel = {}, {}
+
+    def lift_fields():
+        for comment in iter_comments(path):
+            if comment['video_id'] not in videos:
+                video = {'video_id': comment['video_id']}
+                for field, name in VIDEO_FIELDS.items():
+                    video[name] = comment.get(field)
+                videos[comment['video_id']] = video
+            for field in VIDEO_FIELDS:
+                comment.pop(field, None)
+            for field, name in CHANNEL_FIELDS.items():
+                channel.setdefault(name, comment.pop(field, None))
+            yield comment
+
+    return lift_fields(), videos, channel
+
+
+def load_report(path: Union[str, Path]) -> Tuple[List[Dict], Dict[str, Dict], Dict]:
+    comments, videos, channel = iter_report(path)
+    return list(comments), videos, channel
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import httplib2
+
+DEFAULT_CACHE_FILE = Path('reports') / '.api_cache.db'
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Seconds a cached response stays fresh, per Api endpoint
+DEFAULT_TTLS = {
+    'channels': 7 * 24 * 3600,
+    'search': 7 * 24 * 3600,
+    'playlistItems': 6 * 3600,
+    'videos': 6 * 3600,
+    'commentThreads': 6 * 3600,
+    'comments': 6 * 3600,
+}
+DEFAULT_TTL = 3600
+
+OFFLINE_MISS_BODY = json.dumps({
+    'error': {
+        'code': 504,
+        'message': 'Response Not In Cache (Offline Mode)',
+        'errors': [{'reason': 'notCached', 'message': 'Response Not In Cache (Offline Mode)'}]
+    }
+}).encode('utf-8')
+
+
+def cache_key(uri: str) -> str:
+    # The Api key does not change the response, so it is left out of the key
+    parts = urlsplit(uri)
+    params = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True) if name != 'key')
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(params), ''))
+
+
+def endpoint_of(uri: str) -> str:
+    return urlsplit(uri).path.rstrip('/').rsplit('/', 1)[-1]
+
+
+class ResponseCache:
+    """
+    On-disk cache of successful Api GET responses in a single SQLite file.
+
+    Entries expire after a per-endpoint TTL and the least recently used
+    ones are evicted once the cache grows past max_bytes.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_FILE, max_bytes: int = DEFAULT_MAX_BYTES,
+                 ttls: dict = None, offline: bool = False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL
+            )
+        ''')
+        self._db.execute('CREATE INDEX IF NOT EXISTS idx_responses_accessed_at ON responses (accessed_at)')
+        self._db.commit()
+        self._total_bytes = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def ttl(self, endpoint: str) -> float:
+        return self.ttls.get(endpoint, DEFAULT_TTL)
+
+    def _is_fresh(self, endpoint: str, stored_at: float) -> bool:
+        # Offline mode serves whatever is cached, however old
+        return self.offline or time.time() - stored_at < self.ttl(endpoint)
+
+    def contains(self, uri: str) -> bool:
+        with self._lock:
+            row = self._db.execute(
+                'SELECT endpoint, stored_at FROM responses WHERE key = ?', (cache_key(uri),)
+            ).fetchone()
+        return bool(row) and self._is_fresh(*row)
+
+    def get(self, uri: str) -> Optional[tuple]:
+        key = cache_key(uri)
+        with self._lock:
+            row = self._db.execute(
+                'SELECT endpoint, stored_at, headers, body FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if not row or not self._is_fresh(row[0], row[1]):
+                self.misses += 1
+                return None
+            self._db.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (time.time(), key))
+            self._db.commit()
+            self.hits += 1
+
+        response = httplib2.Response(json.loads(row[2]))
+        response.fromcache = True
+        return response, bytes(row[3])
+
+    def put(self, uri: str, response, content: bytes):
+        key = cache_key(uri)
+        now = time.time()
+        headers = json.dumps(dict(response, status=str(response.status)))
+        size = len(content) + len(headers)
+
+        with self._lock:
+            old = self._db.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            self._db.execute(
+                'INSERT OR REPLACE INTO responses (key, endpoint, stored_at, accessed_at, size, headers, body) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, endpoint_of(uri), now, now, size, headers, sqlite3.Binary(content))
+            )
+            self._total_bytes += size - (old[0] if old else 0)
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes:
+            rows = self._db.execute(
+                'SELECT key, size FROM responses ORDER BY accessed_at LIMIT 100'
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self._total_bytes -= size
+                if self._total_bytes <= self.max_bytes:
+                    break
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class CachingHttp:
+    """
+    httplib2.Http look-alike that answers GET requests from a ResponseCache.
+    """
+
+    def __init__(self, http, cache: ResponseCache):
+        self.http = http
+        self.cache = cache
+
+    def __getattr__(self, name):
+        # googleapiclient reads attributes such as timeout from the wrapped object
+        return getattr(self.http, name)
+
+    def request(self, uri, method='GET', body=None, headers=None, redirections=httplib2.DEFAULT_MAX_REDIRECTS,
+                connection_type=None):
+        if method != 'GET':
+            return self.http.request(uri, method, body, headers, redirections, connection_type)
+
+        cached = self.cache.get(uri)
+        if cached:
+            return cached
+
+        if self.cache.offline:
+            return httplib2.Response({'status': 504, 'content-type': 'application/json'}), OFFLINE_MISS_BODY
+
+        response, content = self.http.request(uri, method, body, headers, redirections, connection_type)
+        if response.status == 200:
+            self.cache.put(uri, response, content)
+        return response, content
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+import json
+import random
+import socket
+import ssl
+import time
+from http.client import HTTPException
+from typing import Callable, Optional, Union
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+RETRYABLE_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded', 'backendError', 'internalError'}
+QUOTA_REASONS = {'quotaExceeded', 'dailyLimitExceeded'}
+# notCached is the offline response cache refusing a request it has no answer for
+PERMANENT_REASONS = {'commentsDisabled', 'notCached'}
+NETWORK_ERRORS = (socket.timeout, ConnectionError, ssl.SSLError, HTTPException, httplib2.HttpLib2Error)
+
+RETRYABLE = 'retryable'
+PERMANENT = 'permanent'
+QUOTA = 'quota'
+
+
+def error_reason(error: HttpError) -> Optional[str]:
+    try:
+        content = error.content.decode('utf-8') if isinstance(error.content, bytes) else error.content
+        return json.loads(content)['error']['errors'][0]['reason']
+    except (ValueError, KeyError, IndexError, TypeError, AttributeError):
+        return None
+
+
+def classify_error(error: BaseException) -> str:
+    if isinstance(error, HttpError):
+        reason = error_reason(error)
+        if reason in QUOTA_REASONS:
+            return QUOTA
+        if reason in PERMANENT_REASONS:
+            return PERMANENT
+        if error.resp.status in RETRYABLE_STATUSES or reason in RETRYABLE_REASONS:
+            return RETRYABLE
+        return PERMANENT
+    if isinstance(error, NETWORK_ERRORS):
+        return RETRYABLE
+    return PERMANENT
+
+
+def describe_error(error: BaseException) -> str:
+    if isinstance(error, HttpError):
+        reason = error_reason(error)
+        return f"Http {error.resp.status}" + (f" {reason}" if reason else '')
+    return type(error).__name__
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter for transient Api and network errors.
+
+    Permanent errors (commentsDisabled, 404, bad requests) and quota errors
+    are raised immediately; everything else gets up to max_attempts tries.
+    """
+
+    def __init__(self, max_attempts: int = 6, base_delay: float = 1.0, max_delay: float = 64.0):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def call(self, func: Callable, description: Union[str, Callable] = 'Api Request'):
+        for attempt in range(self.max_attempts):
+            try:
+                return func()
+            except Exception as e:
+                if classify_error(e) != RETRYABLE or attempt == self.max_attempts - 1:
+                    raise
+                delay = self.backoff(attempt)
+                if callable(description):
+                    description = description()
+                print(f"  ↻ {description} Failed ({describe_error(e)}) - Retrying In {delay:.1f}s")
+                time.sleep(delay)
+
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Dict, Iterator, Optional
+
+DEFAULT_DB_FILE = Path('reports') / 'youtube_comments.db'
+EXPORT_BATCH_SIZE = 5000
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS channels (
+    channel_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT,
+    custom_url TEXT,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    channel_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    published_at TEXT,
+    comment_count INTEGER,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS comments (
+    comment_id TEXT PRIMARY KEY,
+    video_id TEXT NOT NULL,
+    author TEXT,
+    author_channel_id TEXT,
+    text TEXT,
+    like_count INTEGER NOT NULL DEFAULT 0,
+    published_at TEXT,
+    updated_at TEXT,
+    is_reply INTEGER NOT NULL,
+    parent_id TEXT,
+    first_seen_run TEXT NOT NULL,
+    last_seen_run TEXT NOT NULL,
+    position INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_videos_channel_id ON videos (channel_id);
+CREATE INDEX IF NOT EXISTS idx_comments_video_id ON comments (video_id);
+CREATE INDEX IF NOT EXISTS idx_comments_author_channel_id ON comments (author_channel_id);
+CREATE INDEX IF NOT EXISTS idx_comments_published_at ON comments (published_at);
+CREATE INDEX IF NOT EXISTS idx_comments_last_seen_run ON comments (last_seen_run);
+'''
+
+COMMENT_COLUMNS = [
+    'video_id', 'comment_id', 'author', 'author_channel_id', 'text', 'like_count',
+    'published_at', 'updated_at', 'is_reply', 'parent_id'
+]
+
+
+class CommentStore:
+    """
+    SQLite history of every channel, video and comment ever downloaded.
+
+    Comments are upserted by comment_id, so re-runs and resumed runs never
+    duplicate rows. Each row remembers the run that first and last saw it,
+    which is what the per-run Json / Csv / Html exports select on.
+    """
+
+    def __init__(self, path: Path = DEFAULT_DB_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(SCHEMA)
+        self._db.commit()
+        # Export order is insertion order, carried on across runs and resumed runs
+        self._position = self._db.execute('SELECT COALESCE(MAX(position), 0) FROM comments').fetchone()[0]
+
+    def upsert_channel(self, channel_id: str, channel_info: Dict, updated_at: str):
+        with self._lock, self._db:
+            self._db.execute('''
+                INSERT INTO channels (channel_id, title, description, custom_url, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (channel_id) DO UPDATE SET
+                    title = excluded.title,
+                    description = excluded.description,
+                    custom_url = excluded.custom_url,
+                    updated_at = excluded.updated_at
+            ''', (channel_id, channel_info['title'], channel_info.get('description', ''),
+                  channel_info.get('custom_url', ''), updated_at))
+
+    def upsert_videos(self, channel_id: str, videos: List[Dict], updated_at: str):
+        with self._lock, self._db:
+            self._db.executemany('''
+                INSERT INTO videos (video_id, channel_id, title, published_at, comment_count, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (video_id) DO UPDATE SET
+                    channel_id = excluded.channel_id,
+                    title = excluded.title,
+                    published_at = excluded.published_at,
+                    comment_count = COALESCE(excluded.comment_count, videos.comment_count),
+                    updated_at = excluded.updated_at
+            ''', [
+                (video['video_id'], channel_id, video['title'], video.get('published_at'),
+                 video.get('comment_count'), updated_at)
+                for video in videos
+            ])
+
+    def upsert_comments(self, comments: List[Dict], run: str):
+        # One transaction per page keeps inserts fast and a crash never leaves half a page
+        with self._lock, self._db:
+            rows = []
+            for comment in comments:
+                self._position += 1
+                rows.append((
+                    comment['comment_id'], comment['video_id'], comment['author'], comment['author_channel_id'],
+                    comment['text'], comment['like_count'], comment['published_at'], comment['updated_at'],
+                    int(bool(comment['is_reply'])), comment['parent_id'], run, run, self._position
+                ))
+            self._db.executemany('''
+                INSERT INTO comments (comment_id, video_id, author, author_channel_id, text, like_count,
+                                      published_at, updated_at, is_reply, parent_id,
+                                      first_seen_run, last_seen_run, position)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (comment_id) DO UPDATE SET
+                    author = excluded.author,
+                    author_channel_id = excluded.author_channel_id,
+                    text = excluded.text,
+                    like_count = excluded.like_count,
+                    updated_at = excluded.updated_at,
+                    last_seen_run = excluded.last_seen_run,
+                    position = excluded.position
+            ''', rows)
+
+    def iter_comments(self, channel_id: str, run: Optional[str] = None, new_only: bool = False,
+                      batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[Dict]]:
+        # Streams flat comment dicts (the classic report schema) in batches, in the order they were stored
+        query = f'''
+            SELECT {', '.join('c.' + column for column in COMMENT_COLUMNS)},
+                   v.title, v.published_at, ch.title
+            FROM comments c
+            JOIN videos v ON v.video_id = c.video_id
+            JOIN channels ch ON ch.channel_id = v.channel_id
+            WHERE v.channel_id = ?
+        '''
+        params = [channel_id]
+        if run:
+            query += ' AND c.first_seen_run = ?' if new_only else ' AND c.last_seen_run = ?'
+            params.append(run)
+        query += ' ORDER BY c.position'
+
+        with self._lock:
+            cursor = self._db.cursor()
+            cursor.execute(query, params)
+
+        try:
+            while True:
+                with self._lock:
+                    rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [self._row_to_comment(row) for row in rows]
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _row_to_comment(row: tuple) -> Dict:
+        comment = dict(zip(COMMENT_COLUMNS, row))
+        comment['is_reply'] = bool(comment['is_reply'])
+        comment['video_title'] = row[-3]
+        comment['video_published_at'] = row[-2]
+        comment['channel_name'] = row[-1]
+        return comment
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from comment_record import Comment, format_timestamp, parse_timestamp
+
+
+class TimestampTest(unittest.TestCase):
+    def test_api_timestamps_become_epoch_seconds(self):
+        self.assertEqual(parse_timestamp('2024-02-01T12:34:56Z'), 1706790896)
+        self.assertEqual(parse_timestamp('1969-12-31T23:59:59Z'), -1)
+        self.assertEqual(format_timestamp(1706790896), '2024-02-01T12:34:56Z')
+
+    def test_other_values_are_kept_verbatim(self):
+        for value in ('', None, 'yesterday', '2024-W05-4T12:34:56Z', '2024-02-01T12+01:00Z',
+                      '2024-02-01T24:00:00Z', '2024-02-01 12:34:56Z'):
+            self.assertEqual(parse_timestamp(value), value)
+            self.assertEqual(Comment(published_at=value)['published_at'], value)
+
+
+if __name__ == '__main__':
+    unittest.main()
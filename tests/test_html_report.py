@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+
+import io
+import json
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import html_report_generator
+from html_report_generator import ShardWriter
+
+
+def shard_tokens(texts) -> dict:
+    out = io.StringIO()
+    shard = ShardWriter(out)
+    for index, text in enumerate(texts):
+        shard.add({'comment_id': str(index), 'video_id': 'v1', 'text': text, 'published_at': '2024-03-01T00:00:00Z'})
+    shard.finish()
+    return json.loads(out.getvalue())['search']['tokens']
+
+
+class ShardWriterTest(unittest.TestCase):
+    def test_spilled_word_index_matches_the_in_memory_one(self):
+        texts = [f'the word{index % 7} and Word{index % 3} the' for index in range(200)]
+        expected = shard_tokens(texts)
+        self.assertEqual(expected['the'], [0] + [1] * 199)
+
+        with mock.patch.object(html_report_generator, 'POSTINGS_SPILL_SIZE', 5), \
+                mock.patch.object(html_report_generator, 'MAX_POSTINGS_RUNS', 4):
+            self.assertEqual(shard_tokens(texts), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
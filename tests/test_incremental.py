@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from incremental import IncrementalState
+
+
+def comment(comment_id: str, day: int) -> dict:
+    return {
+        'video_id': 'v1', 'comment_id': comment_id, 'is_reply': False,
+        'published_at': f'2024-03-{day:02d}T00:00:00Z'
+    }
+
+
+class IncrementalStateTest(unittest.TestCase):
+
+    def test_later_pages_of_a_video_are_not_known(self):
+        with tempfile.TemporaryDirectory() as channel_dir:
+            previous = IncrementalState(Path(channel_dir))
+            previous.add_comments([comment('old', 1)])
+            previous.complete_video('v1', 1)
+            previous.save()
+
+            state = IncrementalState(Path(channel_dir))
+            # Newest first, as requested with order=time: three pages of new comments, then the old one
+            pages = [[comment(f'c{day}', day) for day in range(start, start - 3, -1)] for start in (28, 25, 22)]
+            for page in pages:
+                for item in page:
+                    self.assertFalse(state.is_known('v1', item['comment_id'], item['published_at']))
+                state.add_comments(page)
+            self.assertTrue(state.is_known('v1', 'old', '2024-03-01T00:00:00Z'))
+
+            state.complete_video('v1', 10)
+            state.save()
+            self.assertTrue(IncrementalState(Path(channel_dir)).is_known('v1', 'c28', '2024-03-28T00:00:00Z'))
+
+    def test_unfinished_video_is_not_marked_known(self):
+        with tempfile.TemporaryDirectory() as channel_dir:
+            previous = IncrementalState(Path(channel_dir))
+            previous.add_comments([comment('old', 1)])
+            previous.complete_video('v1', 1)
+            previous.save()
+
+            # A run that fails after the first page of new comments
+            failed = IncrementalState(Path(channel_dir))
+            failed.add_comments([comment(f'c{day}', day) for day in range(28, 20, -1)])
+            failed.save()
+
+            state = IncrementalState(Path(channel_dir))
+            self.assertFalse(state.is_known('v1', 'c10', '2024-03-10T00:00:00Z'))
+            self.assertTrue(state.is_known('v1', 'old', '2024-03-01T00:00:00Z'))
+            self.assertEqual(state.comment_count('v1'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from quota import QuotaScheduler
+
+
+class FakeKeys:
+    def key_id(self, api_key):
+        return api_key
+
+    def record(self, api_key, cost):
+        pass
+
+    def reactivate(self):
+        pass
+
+
+class QuotaStateTest(unittest.TestCase):
+    def test_spending_is_saved_on_flush_and_survives_a_reload(self):
+        with tempfile.TemporaryDirectory() as reports:
+            state_file = Path(reports) / '.quota_usage.json'
+            scheduler = QuotaScheduler(state_file=state_file)
+            for _ in range(3):
+                self.assertTrue(scheduler.charge(FakeKeys(), 'key', 2))
+            scheduler.flush()
+
+            self.assertEqual(json.loads(state_file.read_text())['spent'], {'key': 6})
+            self.assertEqual(QuotaScheduler(state_file=state_file).spent_today, 6)
+            self.assertEqual([path.name for path in Path(reports).iterdir()], ['.quota_usage.json'])
+
+    def test_refused_charge_saves_the_spending(self):
+        with tempfile.TemporaryDirectory() as reports:
+            state_file = Path(reports) / '.quota_usage.json'
+            scheduler = QuotaScheduler(daily_budget=10, reserve=0, state_file=state_file)
+            self.assertTrue(scheduler.charge(FakeKeys(), 'key', 8))
+            self.assertFalse(scheduler.charge(FakeKeys(), 'key', 8))
+            self.assertEqual(json.loads(state_file.read_text())['spent'], {'key': 8})
+
+
+if __name__ == '__main__':
+    unittest.main()
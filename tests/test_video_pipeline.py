@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from video_pipeline import VideoPipeline
+
+PAGE_SIZE = 100
+
+
+class VideoPipelineTest(unittest.TestCase):
+    def test_buffer_stays_bounded_while_the_first_video_is_written(self):
+        videos = [{'video_id': f'v{i}', 'pages': 60} for i in range(4)]
+        workers = 3
+        peak = [0]
+        lock = threading.Lock()
+
+        def fetch(video):
+            for number in range(video['pages']):
+                with lock:
+                    peak[0] = max(peak[0], pipeline._buffered)
+                time.sleep(0.0005)
+                token = None if number == video['pages'] - 1 else str(number + 1)
+                yield [video['video_id']] * PAGE_SIZE, token
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pipeline = VideoPipeline(fetch, videos, workers, executor, max_buffered=1000)
+            written = []
+            for download in pipeline:
+                for page, _ in download:
+                    # The writer is slower than the workers
+                    time.sleep(0.001)
+                    written.extend(page)
+
+        self.assertEqual(written, [video['video_id'] for video in videos for _ in range(60 * PAGE_SIZE)])
+        # Up to the limit for the video being written and for the others, plus a page per worker
+        self.assertLessEqual(peak[0], 2 * 1000 + workers * PAGE_SIZE)
+
+    def test_pages_larger_than_the_buffer_get_through(self):
+        videos = [{'video_id': f'v{i}'} for i in range(4)]
+
+        def fetch(video):
+            yield [video['video_id']] * 300, '1'
+            yield [video['video_id']] * 300, None
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pipeline = VideoPipeline(fetch, videos, 2, executor, max_buffered=100)
+            written = [len(page) for download in pipeline for page, _ in download]
+
+        self.assertEqual(written, [300] * 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+import socket
+import threading
+from importlib.util import find_spec
+from typing import List
+
+import httplib2
+
+TRANSPORTS = ['httplib2', 'httpx']
+DEFAULT_TIMEOUT = 60
+DEFAULT_POOL_SIZE = 10
+
+
+# httpx is only imported when its transport is used, to keep startup fast
+def httpx_available() -> bool:
+    return find_spec('httpx') is not None
+
+
+def http2_available() -> bool:
+    return httpx_available() and find_spec('h2') is not None
+
+
+class Httplib2Transport:
+    """
+    Keep-alive httplib2 connections, one per thread and shared by every Api key.
+
+    httplib2.Http is not thread-safe, so each worker thread gets its own
+    and keeps reusing its connection (and Tls session) for every request.
+    """
+
+    name = 'httplib2'
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, gzip: bool = True):
+        self.timeout = timeout
+        self.gzip = gzip
+        self._local = threading.local()
+        self._connections: List[httplib2.Http] = []
+        self._lock = threading.Lock()
+
+    def _http(self) -> httplib2.Http:
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = self._local.http = httplib2.Http(timeout=self.timeout)
+            with self._lock:
+                self._connections.append(http)
+        return http
+
+    def request(self, uri, method='GET', body=None, headers=None, redirections=httplib2.DEFAULT_MAX_REDIRECTS,
+                connection_type=None):
+        headers = dict(headers or {})
+        headers['accept-encoding'] = 'gzip' if self.gzip else 'identity'
+        return self._http().request(uri, method, body, headers, redirections, connection_type)
+
+    def close(self):
+        with self._lock:
+            for http in self._connections:
+                http.close()
+            self._connections.clear()
+
+
+class HttpxTransport:
+    """
+    httpx connection pool shared by all threads, over Http/2 when h2 is installed.
+
+    Http/2 multiplexes the requests of every worker over a single connection;
+    otherwise up to pool_size keep-alive Http/1.1 connections are reused.
+    Responses are handed to googleapiclient as httplib2 responses.
+    """
+
+    name = 'httpx'
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, timeout: float = DEFAULT_TIMEOUT,
+                 gzip: bool = True, http2: bool = True):
+        if not httpx_available():
+            raise RuntimeError("The httpx Transport Needs The httpx Package (pip install httpx[http2])")
+        import httpx
+
+        self.timeout = timeout
+        self.gzip = gzip
+        self.http2 = http2 and http2_available()
+        self._errors = (httpx.TimeoutException, httpx.TransportError)
+        self._client = httpx.Client(
+            http2=self.http2,
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        )
+
+    def request(self, uri, method='GET', body=None, headers=None, redirections=httplib2.DEFAULT_MAX_REDIRECTS,
+                connection_type=None):
+        # Network failures are raised as the errors the retry policy already knows
+        timeout_error, transport_error = self._errors
+        # googleapiclient sets its own accept-encoding on every request, which would win over a client default
+        headers = dict(headers or {})
+        headers['accept-encoding'] = 'gzip' if self.gzip else 'identity'
+        try:
+            reply = self._client.request(method, uri, content=body, headers=headers)
+        except timeout_error as e:
+            raise socket.timeout(str(e)) from e
+        except transport_error as e:
+            raise ConnectionError(str(e)) from e
+
+        # httpx has already decompressed the body
+        info = {name: value for name, value in reply.headers.items()
+                if name not in ('content-encoding', 'content-length')}
+        info['status'] = str(reply.status_code)
+        response = httplib2.Response(info)
+        response.reason = reply.reason_phrase
+        return response, reply.content
+
+    def close(self):
+        self._client.close()
+
+
+def create_transport(name: str = 'httplib2', pool_size: int = DEFAULT_POOL_SIZE,
+                     timeout: float = DEFAULT_TIMEOUT, gzip: bool = True):
+    if name == 'httpx':
+        return HttpxTransport(pool_size=pool_size, timeout=timeout, gzip=gzip)
+    return Httplib2Transport(timeout=timeout, gzip=gzip)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Callable, Iterator, Optional
+
+# Comments fetched ahead of the writer before no further videos are started
+MAX_BUFFERED_COMMENTS = 200_000
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class VideoDownload:
+    """
+    The (comments, next_page_token) pages of one video, with download statistics.
+
+    In a parallel run a worker thread fills it while the writer reads it,
+    so pages are written as soon as they arrive instead of once the whole
+    video is done. In a serial run the pages are fetched as they are read.
+    """
+
+    def __init__(self, pages: Iterator[tuple] = None, on_read: Callable[[int], None] = None):
+        self.pages = 0
+        self.comments = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._source = pages
+        self._queue = queue.Queue()
+        self._on_read = on_read
+
+    @property
+    def rate(self) -> float:
+        # Comments per second while this video was being downloaded
+        if self.started_at is None:
+            return 0.0
+        elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return self.comments / elapsed if elapsed > 0 else 0.0
+
+    def _count(self, page: tuple):
+        self.pages += 1
+        self.comments += len(page[0])
+
+    def fetch(self, make_pages: Callable[[], Iterator[tuple]], closed: threading.Event,
+              on_fetched: Callable[[int], None]):
+        # Runs on a worker thread
+        self.started_at = time.monotonic()
+        try:
+            for page in make_pages():
+                self._count(page)
+                on_fetched(len(page[0]))
+                self._queue.put(page)
+                if closed.is_set():
+                    break
+        except BaseException as e:
+            self._queue.put(_Failure(e))
+            raise
+        finally:
+            self.finished_at = time.monotonic()
+            self._queue.put(_DONE)
+
+    def __iter__(self) -> Iterator[tuple]:
+        if self._source is not None:
+            self.started_at = time.monotonic()
+            for page in self._source:
+                self._count(page)
+                yield page
+            self.finished_at = time.monotonic()
+            return
+
+        while True:
+            page = self._queue.get()
+            if page is _DONE:
+                return
+            if isinstance(page, _Failure):
+                raise page.error
+            if self._on_read:
+                self._on_read(len(page[0]))
+            yield page
+
+
+class VideoPipeline:
+    """
+    Downloads a channel's videos on a worker pool and hands them over in order.
+
+    The comment pages of a video are chained by nextPageToken, so one video
+    is always paged through by a single worker. Instead of a fixed window of
+    videos, a worker moves on to the next video as soon as its own is done,
+    while the video being written streams through page by page. With the
+    largest videos first the biggest one starts right away and the rest of
+    the channel is downloaded alongside it. Once max_buffered comments are
+    waiting to be written no further videos are started, and workers on
+    videos other than the one being written pause until there is room again.
+    The video being written only waits for its own unread pages.
+    """
+
+    def __init__(self, fetch: Callable[[Dict], Iterator[tuple]], videos: List[Dict], workers: int = 1,
+                 executor: ThreadPoolExecutor = None, max_buffered: int = MAX_BUFFERED_COMMENTS):
+        self.fetch = fetch
+        self.videos = videos
+        self.workers = workers
+        self.executor = executor
+        self.max_buffered = max_buffered
+
+        self._next = 0
+        self._running = 0
+        self._buffered = 0
+        self._failed = False
+        self._head = 0
+        self._lock = threading.Lock()
+        self._room = threading.Condition(self._lock)
+        self._closed = threading.Event()
+        self._unread = [0] * len(videos)
+        self._downloads = [VideoDownload(on_read=lambda count, index=index: self._read(index, count))
+                           for index in range(len(videos))]
+
+    def __iter__(self) -> Iterator[VideoDownload]:
+        if self.workers <= 1 or self.executor is None:
+            for video in self.videos:
+                yield VideoDownload(self.fetch(video))
+            return
+
+        try:
+            for index, download in enumerate(self._downloads):
+                with self._lock:
+                    self._head = index
+                    self._room.notify_all()
+                # The video being written is started even when the buffer is full
+                self._dispatch(until=index)
+                yield download
+        finally:
+            with self._lock:
+                self._closed.set()
+                self._room.notify_all()
+
+    def _dispatch(self, until: int = -1):
+        with self._lock:
+            while self._next < len(self.videos) and not self._closed.is_set() and (
+                    self._next <= until or
+                    (not self._failed and self._running < self.workers and self._buffered < self.max_buffered)):
+                index = self._next
+                self._next += 1
+                self._running += 1
+                self.executor.submit(self._run, index)
+
+    def _run(self, index: int):
+        try:
+            self._downloads[index].fetch(lambda: self.fetch(self.videos[index]), self._closed,
+                                         lambda count: self._fetched(index, count))
+        except BaseException:
+            # Quota exhausted or an unexpected error: the writer raises it when it gets
+            # to this video, and no further videos are started ahead of the writer
+            self._failed = True
+        finally:
+            with self._lock:
+                self._running -= 1
+            self._dispatch()
+
+    def _fetched(self, index: int, count: int):
+        # Runs on the worker before it queues the page, and waits on what is queued already so
+        # even a page larger than max_buffered gets through. The video being written never waits
+        # on the pages of other videos, as those are only read once it is done
+        with self._lock:
+            self._buffered += count
+            self._unread[index] += count
+            while not self._closed.is_set() and (
+                    self._unread[index] - count >= self.max_buffered if index == self._head
+                    else self._buffered - count >= self.max_buffered):
+                self._room.wait()
+
+    def _read(self, index: int, count: int):
+        with self._lock:
+            self._buffered -= count
+            self._unread[index] -= count
+            self._room.notify_all()
+        self._dispatch()
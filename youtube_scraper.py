@@ -1,87 +1,288 @@
 #!/usr/bin/env python3
 
 import os
+import sys
 import json
 import csv
-from googleapiclient.discovery import build
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from googleapiclient.errors import HttpError
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Callable, Iterator, Union
 from pathlib import Path
 import re
 
+from checkpoint import Checkpoint
+from comment_record import Comment, parse_timestamp
+from incremental import IncrementalState
+from retry import RetryPolicy, classify_error, describe_error, error_reason, NETWORK_ERRORS, PERMANENT
+from key_pool import ApiKeyPool
+from channel_ids import ChannelIdCache, MISSING
+from response_cache import ResponseCache, DEFAULT_MAX_BYTES
+from quota import QuotaScheduler, QuotaBudgetExhausted, DEFAULT_DAILY_BUDGET, DEFAULT_RESERVE
+from storage import CommentStore, DEFAULT_DB_FILE
+from report_io import open_text, zstd_available, metadata_path, OUTPUT_FORMATS, COMPRESSIONS, VIDEO_FIELDS
+from transport import create_transport, httpx_available, TRANSPORTS, DEFAULT_TIMEOUT
+from video_pipeline import VideoPipeline
+
 YOUTUBE_API_KEY = "****************************************"
+DEFAULT_WORKERS = 1
+# Pages of a long video between two progress lines
+PROGRESS_PAGES = 50
 
-class YouTubeCommentsScraper:
-    def __init__(self, api_key: str):
-        self.api_key = api_key
-        self.youtube = build('youtube', 'v3', developerKey=api_key)
+COMMENT_FIELDS = [
+    'video_id', 'comment_id', 'author', 'author_channel_id', 'text', 'like_count',
+    'published_at', 'updated_at', 'is_reply', 'parent_id',
+    'video_title', 'video_published_at', 'channel_name'
+]
+# The normalized layout keeps video and channel fields in a separate .meta.json instead
+NORMALIZED_COMMENT_FIELDS = COMMENT_FIELDS[:10]
+
+# Partial responses (fields=): only the keys the scraper reads are downloaded, which drops
+# thumbnails, descriptions, textOriginal, profile urls and etags from every page.
+# Empty lists are left out of partial responses, so items is read with .get()
+COMMENT_SNIPPET_FIELDS = 'authorDisplayName,authorChannelId/value,textDisplay,likeCount,publishedAt,updatedAt'
+COMMENT_THREAD_FIELDS = (
+    f'nextPageToken,items(snippet(totalReplyCount,topLevelComment(id,snippet({COMMENT_SNIPPET_FIELDS}))),'
+    f'replies/comments(id,snippet({COMMENT_SNIPPET_FIELDS})))'
+)
+REPLY_FIELDS = f'nextPageToken,items(id,snippet({COMMENT_SNIPPET_FIELDS}))'
+PLAYLIST_ITEM_FIELDS = 'nextPageToken,items/snippet(title,publishedAt,resourceId/videoId)'
+VIDEO_STATISTICS_FIELDS = 'items(id,statistics/commentCount)'
+
+
+class ReportWriter:
+    def __init__(self, channel_dir: Path, timestamp: str = None, output_format: str = 'jsonl',
+                 compression: str = 'none', parquet: bool = False, normalized: bool = False,
+                 channel: Dict = None, sharded_html: bool = False):
+        self.timestamp = timestamp or datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.output_format = output_format
+        self.normalized = normalized
+        self.sharded_html = sharded_html
+        self.channel = dict(channel or {})
+        self.videos: Dict[str, Dict] = {}
+        self.fields = NORMALIZED_COMMENT_FIELDS if normalized else COMMENT_FIELDS
+        suffix = COMPRESSIONS[compression]
+        self.json_file = channel_dir / f'youtube_comments_{self.timestamp}.{output_format}{suffix}'
+        self.csv_file = channel_dir / f'youtube_comments_{self.timestamp}.csv{suffix}'
+        self.html_file = channel_dir / f'youtube_comments_report_{self.timestamp}.html'
+        self.parquet_file = channel_dir / f'youtube_comments_{self.timestamp}.parquet' if parquet else None
+        self.meta_file = metadata_path(self.json_file) if normalized else None
+        self.comment_count = 0
+        
+        self._parquet = None
+        if parquet:
+            # pyarrow takes a while to import, so it is only loaded for Parquet exports
+            from parquet_export import ParquetReportWriter
+            self._parquet = ParquetReportWriter(self.parquet_file)
+        self._json = open_text(self.json_file, 'w', compression)
+        self._csv_handle = open_text(self.csv_file, 'w', compression, newline='')
+        self._csv = csv.DictWriter(self._csv_handle, fieldnames=self.fields)
+        self._csv.writeheader()
+        if output_format == 'json':
+            # Written as a stream of array items, one comment per line, so the file is never held in memory
+            self._json.write('[')
+    
+    def write(self, comments: List[Union[Comment, Dict]]):
+        comments = [comment.to_dict() if isinstance(comment, Comment) else comment for comment in comments]
+        if self._parquet:
+            self._parquet.write(comments)
+        if self.normalized:
+            comments = self._normalize(comments)
         
+        if self.output_format == 'json':
+            for comment in comments:
+                self._json.write(',\n' if self.comment_count else '\n')
+                self._json.write(json.dumps(comment, ensure_ascii=False))
+                self.comment_count += 1
+        else:
+            for comment in comments:
+                self._json.write(json.dumps(comment, ensure_ascii=False) + '\n')
+            self.comment_count += len(comments)
+        self._csv.writerows(comments)
+    
+    def _normalize(self, comments: List[Dict]) -> List[Dict]:
+        # Video and channel fields are stored once, in the .meta.json, instead of on every comment
+        for comment in comments:
+            if comment['video_id'] not in self.videos:
+                video = {'video_id': comment['video_id']}
+                for field, name in VIDEO_FIELDS.items():
+                    video[name] = comment.get(field)
+                self.videos[comment['video_id']] = video
+            self.channel.setdefault('title', comment.get('channel_name'))
+        return [{field: comment[field] for field in self.fields} for comment in comments]
+    
+    def abort(self):
+        self._json.close()
+        self._csv_handle.close()
+        if self._parquet:
+            self._parquet.abort()
+    
+    def close(self) -> Optional[str]:
+        if self.output_format == 'json':
+            self._json.write('\n]\n')
+        self._json.close()
+        self._csv_handle.close()
+        if self._parquet:
+            self._parquet.close()
+        
+        if not self.comment_count:
+            self.json_file.unlink()
+            self.csv_file.unlink()
+            if self.parquet_file:
+                self.parquet_file.unlink()
+            print("No Comments To Save")
+            return None
+        
+        print(f"\n✅ {'Json Lines' if self.output_format == 'jsonl' else 'Json'} Saved: {self.json_file}")
+        print(f"✅ Csv Saved: {self.csv_file}")
+        if self.meta_file:
+            with open(self.meta_file, 'w', encoding='utf-8') as f:
+                json.dump({'channel': self.channel, 'videos': list(self.videos.values())}, f, ensure_ascii=False)
+            print(f"✅ Videos And Channel Saved: {self.meta_file}")
+        if self.parquet_file:
+            print(f"✅ Parquet Saved: {self.parquet_file}")
+        
+        try:
+            from html_report_generator import generate_html_report
+            generate_html_report(str(self.json_file), str(self.html_file), self.sharded_html)
+        except ImportError:
+            print("⚠️ Html Report Generator Not Found - Skipping Html Generation")
+        except Exception as e:
+            print(f"⚠️ Error Generating Html Report: {e}")
+        return str(self.json_file)
+
+
+class YouTubeCommentsScraper:
+    def __init__(self, api_key: Union[str, List[str]], workers: int = DEFAULT_WORKERS, scheduler: QuotaScheduler = None,
+                 cache: ResponseCache = None, channel_ids: ChannelIdCache = None, expand_replies: bool = True,
+                 store: CommentStore = None, output_format: str = 'jsonl', compression: str = 'none',
+                 parquet: bool = False, normalized: bool = False, sharded_html: bool = False, transport=None):
+        # Every Api request of the scraper goes through this transport's connection pool
+        self.transport = transport or create_transport(pool_size=2 * max(1, workers))
+        self.keys = ApiKeyPool(api_key, cache, self.transport)
+        self.store = store or CommentStore()
+        self.output_format = output_format
+        self.compression = compression
+        self.parquet = parquet
+        self.normalized = normalized
+        self.sharded_html = sharded_html
+        self.expand_replies = expand_replies
+        self.channel_ids = channel_ids or ChannelIdCache()
+        self.workers = max(1, workers)
+        self.scheduler = scheduler or QuotaScheduler()
+        # Failed requests per channel; channels of a batch record theirs from many threads at once
+        self.failures: Dict[Optional[str], List[Dict]] = {}
+        self._failures_lock = threading.Lock()
+        self.run_summaries: Dict[str, Dict] = {}
+        self._executors: Dict[tuple, ThreadPoolExecutor] = {}
+        self._executors_lock = threading.Lock()
+        self._local = threading.local()
+    
+    def _execute(self, make_request: Callable, video_id: str = None) -> Dict:
+        # Every Api call goes through the quota scheduler, which picks the key and its client;
+        # make_request builds the request from that client
+        return self.scheduler.execute(make_request, self.keys, getattr(self._local, 'channel_id', None), video_id)
+    
+    def _get_executor(self, workers: int, name: str = 'video') -> ThreadPoolExecutor:
+        # One long-lived pool per name and size, shared by every channel of a batch so worker threads
+        # (and their per-thread Api clients and connections) are reused across channels.
+        # Video workers wait on the reply pool, so the two must never be the same pool
+        with self._executors_lock:
+            if (name, workers) not in self._executors:
+                self._executors[name, workers] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+            return self._executors[name, workers]
+    
+    def close(self):
+        with self._executors_lock:
+            for executor in self._executors.values():
+                executor.shutdown(wait=False)
+            self._executors.clear()
+        self.scheduler.flush()
+        self.store.close()
+        self.transport.close()
+    
+    def resolve_channel(self, value: str) -> Optional[str]:
+        # Accepts a channel id, a channel / handle url or a handle / name
+        value = value.strip()
+        if re.fullmatch(r'UC[\w-]{22}', value):
+            return value
+        if value.startswith(('http://', 'https://', 'www.', 'youtube.com', 'm.youtube.com')):
+            return self.get_channel_id(channel_url=value)
+        return self.get_channel_id(channel_handle=value)
+    
     def get_channel_id(self, channel_username: str = None, channel_url: str = None, channel_handle: str = None) -> Optional[str]:
+        if channel_url:
+            if '/channel/' in channel_url:
+                return channel_url.split('/channel/')[1].split('/')[0].split('?')[0]
+            elif '@' in channel_url:
+                channel_handle = channel_url.split('@')[1].split('/')[0].split('?')[0]
+            elif '/c/' in channel_url:
+                channel_username = channel_url.split('/c/')[1].split('/')[0].split('?')[0]
+            elif '/user/' in channel_url:
+                channel_username = channel_url.split('/user/')[1].split('/')[0].split('?')[0]
+        
+        if channel_handle:
+            name = channel_handle.lstrip('@')
+            cache_key = ChannelIdCache.key('handle', name)
+            lookups = ['forHandle', 'forUsername']
+        elif channel_username:
+            name = channel_username
+            cache_key = ChannelIdCache.key('username', name)
+            lookups = ['forUsername', 'forHandle']
+        else:
+            return None
+        
+        channel_id = self.channel_ids.get(cache_key)
+        if channel_id is not MISSING:
+            return channel_id
+        
         try:
-            if channel_handle:
-                channel_handle = channel_handle.lstrip('@')
-                try:
-                    request = self.youtube.search().list(
-                        part='snippet',
-                        q=channel_handle,
-                        type='channel',
-                        maxResults=1
-                    )
-                    response = request.execute()
-                    if response['items']:
-                        return response['items'][0]['snippet']['channelId']
-                except:
-                    pass
-                
-                channel_username = channel_handle
-            
-            if channel_username:
-                try:
-                    request = self.youtube.channels().list(
-                        part='id',
-                        forUsername=channel_username
-                    )
-                    response = request.execute()
-                    
-                    if response['items']:
-                        return response['items'][0]['id']
-                except:
-                    pass
-                
-                request = self.youtube.search().list(
-                    part='snippet',
-                    q=channel_username,
-                    type='channel',
-                    maxResults=1
-                )
-                response = request.execute()
-                
-                if response['items']:
-                    return response['items'][0]['snippet']['channelId']
-            
-            if channel_url:
-                if '@' in channel_url:
-                    username = channel_url.split('@')[1].split('/')[0]
-                    return self.get_channel_id(channel_handle=username)
-                elif '/channel/' in channel_url:
-                    return channel_url.split('/channel/')[1].split('/')[0].split('?')[0]
-                elif '/c/' in channel_url:
-                    username = channel_url.split('/c/')[1].split('/')[0]
-                    return self.get_channel_id(channel_username=username)
-                    
+            channel_id = self._lookup_channel_id(name, lookups)
         except HttpError as e:
+            # Not cached: the channel may well exist, the lookup just failed
             print(f"Error Getting Channel ID: {e}")
+            return None
+        
+        self.channel_ids.set(cache_key, channel_id)
+        return channel_id
+    
+    def _lookup_channel_id(self, name: str, lookups: List[str]) -> Optional[str]:
+        # channels().list costs 1 unit, so both exact lookups are tried before a 100 unit search
+        for lookup in lookups:
+            value = f'@{name}' if lookup == 'forHandle' else name
+            try:
+                response = self._execute(lambda youtube: youtube.channels().list(
+                    part='id',
+                    **{lookup: value}
+                ))
+                
+                if response.get('items'):
+                    return response['items'][0]['id']
+            except TypeError:
+                # forHandle is missing from the discovery document of older client libraries
+                pass
+            except HttpError:
+                pass
+        
+        response = self._execute(lambda youtube: youtube.search().list(
+            part='snippet',
+            q=name,
+            type='channel',
+            maxResults=1
+        ))
         
+        if response['items']:
+            return response['items'][0]['snippet']['channelId']
         return None
     
     def get_channel_info(self, channel_id: str) -> Dict:
         try:
-            request = self.youtube.channels().list(
+            response = self._execute(lambda youtube: youtube.channels().list(
                 part='snippet',
                 id=channel_id
-            )
-            response = request.execute()
+            ))
             
             if response['items']:
                 snippet = response['items'][0]['snippet']
@@ -103,15 +304,25 @@ class YouTubeCommentsScraper:
             filename = filename[:100]
         return filename
     
-    def get_channel_videos(self, channel_id: str) -> List[Dict]:
+    def get_channel_videos(self, channel_id: str, checkpoint: Checkpoint = None) -> List[Dict]:
         videos = []
+        next_page_token = None
+        
+        if checkpoint and checkpoint.videos:
+            videos = list(checkpoint.videos)
+            next_page_token = checkpoint.videos_page_token
+            
+            if checkpoint.videos_complete or not next_page_token:
+                print(f"Resuming With {len(videos)} Videos From Checkpoint")
+                return videos
+            
+            print(f"Resuming Video List After {len(videos)} Videos")
         
         try:
-            request = self.youtube.channels().list(
+            response = self._execute(lambda youtube: youtube.channels().list(
                 part='contentDetails',
                 id=channel_id
-            )
-            response = request.execute()
+            ))
             
             if not response['items']:
                 print("Channel Not Found")
@@ -119,184 +330,693 @@ class YouTubeCommentsScraper:
             
             uploads_playlist_id = response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
             
-            next_page_token = None
+            def collect(page, page_token):
+                videos.extend(page)
+                if checkpoint:
+                    checkpoint.record_videos_page(page, page_token)
             
-            while True:
-                request = self.youtube.playlistItems().list(
-                    part='snippet',
-                    playlistId=uploads_playlist_id,
-                    maxResults=50,
-                    pageToken=next_page_token
-                )
-                response = request.execute()
-                
-                for item in response['items']:
-                    video_info = {
-                        'video_id': item['snippet']['resourceId']['videoId'],
-                        'title': item['snippet']['title'],
-                        'published_at': item['snippet']['publishedAt']
-                    }
-                    videos.append(video_info)
-                    print(f"Found Video: {video_info['title']}")
-                
-                next_page_token = response.get('nextPageToken')
-                
-                if not next_page_token:
-                    break
+            # Comment counts of each page (one videos.list call for up to 50 ids) are looked up
+            # in the background while the next page of the playlist is listed
+            statistics = self._get_executor(1, 'statistics')
+            pending = None
+            
+            try:
+                while True:
+                    response = self._execute(lambda youtube: youtube.playlistItems().list(
+                        part='snippet',
+                        playlistId=uploads_playlist_id,
+                        maxResults=50,
+                        pageToken=next_page_token,
+                        fields=PLAYLIST_ITEM_FIELDS
+                    ))
+                    
+                    page = []
+                    for item in response.get('items', []):
+                        video_info = {
+                            'video_id': item['snippet']['resourceId']['videoId'],
+                            'title': item['snippet']['title'],
+                            'published_at': item['snippet']['publishedAt']
+                        }
+                        page.append(video_info)
+                        print(f"Found Video: {video_info['title']}")
+                    
+                    next_page_token = response.get('nextPageToken')
+                    
+                    if pending:
+                        collect(pending[0].result(), pending[1])
+                        pending = None
+                    pending = (statistics.submit(self._add_comment_counts, page, channel_id), next_page_token)
+                    
+                    if not next_page_token:
+                        break
+            finally:
+                # A listed page is kept even when listing the next one fails
+                if pending:
+                    collect(pending[0].result(), pending[1])
+            
+            if checkpoint:
+                checkpoint.record_videos_complete()
             
             print(f"\nTotal Videos Found: {len(videos)}")
             
         except HttpError as e:
-            print(f"Error Getting Videos: {e}")
+            # The video list stays incomplete in the journal, so --resume lists the rest
+            print(f"Error Getting Videos: {describe_error(e)} - Video List Incomplete ({len(videos)} Videos)")
+            self._record_failure(None, next_page_token, e, permanent=classify_error(e) == PERMANENT)
         
         return videos
     
-    def get_video_comments(self, video_id: str) -> List[Dict]:
-        comments = []
+    def get_video_statistics(self, video_ids: List[str]) -> Dict[str, Optional[int]]:
+        comment_counts = {}
         
         try:
-            next_page_token = None
+            for start in range(0, len(video_ids), 50):
+                response = self._execute(lambda youtube: youtube.videos().list(
+                    part='statistics',
+                    id=','.join(video_ids[start:start + 50]),
+                    maxResults=50,
+                    fields=VIDEO_STATISTICS_FIELDS
+                ))
+                
+                for item in response.get('items', []):
+                    # commentCount is missing when comments are disabled
+                    count = item.get('statistics', {}).get('commentCount')
+                    comment_counts[item['id']] = int(count) if count is not None else None
+        
+        except HttpError as e:
+            print(f"Error Getting Video Statistics: {e}")
+        
+        return comment_counts
+    
+    def _add_comment_counts(self, page: List[Dict], channel_id: str) -> List[Dict]:
+        # comment_count is None when comments are disabled; videos the lookup did not
+        # return (private, failed request) get no count and are always downloaded
+        self._local.channel_id = channel_id
+        comment_counts = self.get_video_statistics([video['video_id'] for video in page]) if page else {}
+        for video in page:
+            if video['video_id'] in comment_counts:
+                video['comment_count'] = comment_counts[video['video_id']]
+        return page
+    
+    def _parse_comment_thread(self, item: Dict, video_id: str, replies: List[Dict] = None) -> List[Comment]:
+        top_comment = item['snippet']['topLevelComment']['snippet']
+        
+        comments = [Comment(
+            video_id=video_id,
+            comment_id=item['snippet']['topLevelComment']['id'],
+            author=top_comment['authorDisplayName'],
+            author_channel_id=top_comment.get('authorChannelId', {}).get('value', ''),
+            text=top_comment['textDisplay'],
+            like_count=top_comment['likeCount'],
+            published_at=top_comment['publishedAt'],
+            updated_at=top_comment['updatedAt'],
+            is_reply=False,
+            parent_id=None
+        )]
+        
+        if replies is None:
+            replies = item.get('replies', {}).get('comments', [])
+        
+        for reply in replies:
+            reply_snippet = reply['snippet']
+            
+            comments.append(Comment(
+                video_id=video_id,
+                comment_id=reply['id'],
+                author=reply_snippet['authorDisplayName'],
+                author_channel_id=reply_snippet.get('authorChannelId', {}).get('value', ''),
+                text=reply_snippet['textDisplay'],
+                like_count=reply_snippet['likeCount'],
+                published_at=reply_snippet['publishedAt'],
+                updated_at=reply_snippet['updatedAt'],
+                is_reply=True,
+                parent_id=item['snippet']['topLevelComment']['id']
+            ))
+        
+        return comments
+    
+    def iter_video_comment_pages(self, video_id: str, page_token: str = None,
+                                 incremental: IncrementalState = None) -> Iterator[tuple]:
+        # Yields (comments, next_page_token); a final None token means the video is complete
+        try:
+            next_page_token = page_token
             
             while True:
-                request = self.youtube.commentThreads().list(
+                response = self._execute(lambda youtube: youtube.commentThreads().list(
                     part='snippet,replies',
                     videoId=video_id,
                     maxResults=100,
                     pageToken=next_page_token,
-                    textFormat='plainText'
-                )
-                response = request.execute()
+                    textFormat='plainText',
+                    # Newest first, so paging can stop at the first known comment
+                    order='time' if incremental else None,
+                    fields=COMMENT_THREAD_FIELDS
+                ), video_id=video_id)
                 
-                for item in response['items']:
-                    top_comment = item['snippet']['topLevelComment']['snippet']
-                    
-                    comment_data = {
-                        'video_id': video_id,
-                        'comment_id': item['snippet']['topLevelComment']['id'],
-                        'author': top_comment['authorDisplayName'],
-                        'author_channel_id': top_comment.get('authorChannelId', {}).get('value', ''),
-                        'text': top_comment['textDisplay'],
-                        'like_count': top_comment['likeCount'],
-                        'published_at': top_comment['publishedAt'],
-                        'updated_at': top_comment['updatedAt'],
-                        'is_reply': False,
-                        'parent_id': None
-                    }
-                    comments.append(comment_data)
-                    
-                    if 'replies' in item:
-                        for reply in item['replies']['comments']:
-                            reply_snippet = reply['snippet']
-                            
-                            reply_data = {
-                                'video_id': video_id,
-                                'comment_id': reply['id'],
-                                'author': reply_snippet['authorDisplayName'],
-                                'author_channel_id': reply_snippet.get('authorChannelId', {}).get('value', ''),
-                                'text': reply_snippet['textDisplay'],
-                                'like_count': reply_snippet['likeCount'],
-                                'published_at': reply_snippet['publishedAt'],
-                                'updated_at': reply_snippet['updatedAt'],
-                                'is_reply': True,
-                                'parent_id': item['snippet']['topLevelComment']['id']
-                            }
-                            comments.append(reply_data)
+                items = []
+                reached_known = False
+                for item in response.get('items', []):
+                    top_comment = item['snippet']['topLevelComment']
+                    if incremental and incremental.is_known(video_id, top_comment['id'], top_comment['snippet']['publishedAt']):
+                        reached_known = True
+                        break
+                    items.append(item)
+                
+                full_replies = self._expand_replies(items, video_id) if self.expand_replies else {}
                 
-                next_page_token = response.get('nextPageToken')
+                page = []
+                for item in items:
+                    page.extend(self._parse_comment_thread(item, video_id, full_replies.get(item['snippet']['topLevelComment']['id'])))
+                
+                next_page_token = None if reached_known else response.get('nextPageToken')
+                yield page, next_page_token
                 
                 if not next_page_token:
                     break
             
         except HttpError as e:
-            if e.resp.status == 403:
+            if error_reason(e) == 'commentsDisabled':
                 print(f"Comments Disabled For Video {video_id}")
+                yield [], None
+            elif classify_error(e) == PERMANENT:
+                # Retrying will not help (deleted / private video), so the video counts as done
+                print(f"Error Getting Comments For {video_id}: {describe_error(e)}")
+                self._record_failure(video_id, next_page_token, e, permanent=True)
+                yield [], None
             else:
-                print(f"Error Getting Comments For {video_id}: {e}")
+                print(f"Error Getting Comments For {video_id}: {describe_error(e)}")
+                self._record_failure(video_id, next_page_token, e, permanent=False)
+        except NETWORK_ERRORS as e:
+            print(f"Error Getting Comments For {video_id}: {describe_error(e)}")
+            self._record_failure(video_id, next_page_token, e, permanent=False)
+    
+    def get_comment_replies(self, parent_id: str, video_id: str = None) -> List[Dict]:
+        replies = []
+        next_page_token = None
         
-        return comments
+        while True:
+            response = self._execute(lambda youtube: youtube.comments().list(
+                part='snippet',
+                parentId=parent_id,
+                maxResults=100,
+                pageToken=next_page_token,
+                textFormat='plainText',
+                fields=REPLY_FIELDS
+            ), video_id=video_id)
+            
+            replies.extend(response.get('items', []))
+            next_page_token = response.get('nextPageToken')
+            
+            if not next_page_token:
+                break
+        
+        return replies
     
-    def scrape_channel_comments(self, channel_id: str) -> tuple:
-        all_comments = []
+    def _expand_replies(self, items: List[Dict], video_id: str) -> Dict[str, List[Dict]]:
+        # commentThreads only inlines a handful of replies per thread; fetch the rest only
+        # for threads whose totalReplyCount says some are missing
+        incomplete = [
+            item for item in items
+            if item['snippet'].get('totalReplyCount', 0) > len(item.get('replies', {}).get('comments', []))
+        ]
+        if not incomplete:
+            return {}
         
-        channel_info = self.get_channel_info(channel_id)
-        channel_name = channel_info['title']
+        channel_id = getattr(self._local, 'channel_id', None)
         
-        print(f"\nChannel Name: {channel_name}")
-        print("="*60)
+        def fetch(item):
+            self._local.channel_id = channel_id
+            parent_id = item['snippet']['topLevelComment']['id']
+            try:
+                return parent_id, self.get_comment_replies(parent_id, video_id)
+            except HttpError as e:
+                if classify_error(e) != PERMANENT:
+                    # Fails the video like a comment page would, so --resume fetches this page again
+                    raise
+                # The thread is gone (e.g. deleted meanwhile): keep its inlined replies
+                print(f"Error Getting Replies For {parent_id}: {describe_error(e)}")
+                self._record_failure(video_id, None, e, permanent=True)
+                return parent_id, None
+        
+        if self.workers > 1 and len(incomplete) > 1:
+            results = self._get_executor(self.workers, 'replies').map(fetch, incomplete)
+        else:
+            results = map(fetch, incomplete)
+        
+        return {parent_id: replies for parent_id, replies in results if replies is not None}
+    
+    def _record_failure(self, video_id: str, page_token: Optional[str], error: Exception, permanent: bool):
+        channel_id = getattr(self._local, 'channel_id', None)
+        failure = {
+            'channel_id': channel_id,
+            'video_id': video_id,
+            'page_token': page_token,
+            'error': describe_error(error),
+            'status': error.resp.status if isinstance(error, HttpError) else None,
+            'reason': error_reason(error) if isinstance(error, HttpError) else None,
+            'permanent': permanent,
+            'failed_at': datetime.now().isoformat(timespec='seconds')
+        }
+        with self._failures_lock:
+            self.failures.setdefault(channel_id, []).append(failure)
+    
+    def iter_video_comments(self, video_id: str) -> Iterator[List[Comment]]:
+        for page, _ in self.iter_video_comment_pages(video_id):
+            yield page
+    
+    def get_video_comments(self, video_id: str) -> List[Comment]:
+        comments = []
+        for page in self.iter_video_comments(video_id):
+            comments.extend(page)
+        return comments
+    
+    def iter_channel_comments(self, channel_id: str, channel_name: str, workers: int = None,
+                              checkpoint: Checkpoint = None,
+                              incremental: IncrementalState = None) -> Iterator[List[Comment]]:
+        workers = workers or self.workers
         
-        videos = self.get_channel_videos(channel_id)
+        videos = self.get_channel_videos(channel_id, checkpoint)
         
         if not videos:
             print("No Videos Found")
-            return all_comments, channel_name
+            return
         
-        for idx, video in enumerate(videos, 1):
+        page_tokens = {}
+        saved_count = 0
+        numbered = list(enumerate(videos, 1))
+        if checkpoint:
+            page_tokens = dict(checkpoint.page_tokens)
+            saved_count = checkpoint.comment_count
+            numbered = [(idx, video) for idx, video in numbered if video['video_id'] not in checkpoint.completed_videos]
+            if len(numbered) < len(videos):
+                print(f"\nSkipping {len(videos) - len(numbered)} Videos Already Completed")
+        
+        # Comment counts come with the video list; only videos listed without them are looked up
+        comment_counts = {video['video_id']: video['comment_count'] for _, video in numbered if 'comment_count' in video}
+        
+        if incremental:
+            unknown = [video['video_id'] for _, video in numbered if 'comment_count' not in video]
+            if unknown:
+                comment_counts.update(self.get_video_statistics(unknown))
+            changed = [
+                (idx, video) for idx, video in numbered
+                if video['video_id'] not in incremental.videos
+                or incremental.comment_count(video['video_id']) != comment_counts.get(video['video_id'])
+            ]
+            print(f"\nSkipping {len(numbered) - len(changed)} Videos With No New Comments")
+            numbered = changed
+        
+        # Videos without comments (or with comments disabled) are not requested at all
+        with_comments = [(idx, video) for idx, video in numbered if comment_counts.get(video['video_id'], 1)]
+        if len(with_comments) < len(numbered):
+            print(f"\nSkipping {len(numbered) - len(with_comments)} Videos Without Comments")
+        numbered = with_comments
+        
+        # Largest videos first: the longest downloads start right away instead of holding up the end
+        numbered.sort(key=lambda item: comment_counts.get(item[1]['video_id']) or 0, reverse=True)
+        
+        def fetch_pages(video):
+            self._local.channel_id = channel_id
+            return self.iter_video_comment_pages(video['video_id'], page_tokens.get(video['video_id']), incremental)
+        
+        if workers > 1:
+            print(f"\nDownloading With {workers} Parallel Workers")
+        
+        # Workers fetch ahead while the video being written streams through page by page
+        pipeline = VideoPipeline(fetch_pages, [video for _, video in numbered], workers,
+                                 self._get_executor(workers) if workers > 1 else None)
+        
+        channel_name = sys.intern(channel_name)
+        for (idx, video), download in zip(numbered, pipeline):
             print(f"\n[{idx}/{len(videos)}] Downloading Comments For: {video['title']}")
             
-            comments = self.get_video_comments(video['video_id'])
+            # The video's fields are converted once per video and set on each comment as stored
+            video_title = sys.intern(video['title'])
+            video_published_at = parse_timestamp(video['published_at'])
             
-            for comment in comments:
-                comment['video_title'] = video['title']
-                comment['video_published_at'] = video['published_at']
-                comment['channel_name'] = channel_name
+            video_count = 0
+            pages_read = 0
+            next_page_token = ''
+            for page, next_page_token in download:
+                for comment in page:
+                    comment.video_title = video_title
+                    comment.video_published_at = video_published_at
+                    comment.channel_name = channel_name
+                
+                video_count += len(page)
+                pages_read += 1
+                yield page
+                saved_count += len(page)
+                
+                if incremental:
+                    incremental.add_comments(page)
+                
+                if checkpoint:
+                    checkpoint.record_comments_page(video['video_id'], next_page_token, saved_count)
+                
+                # download.pages counts what the worker fetched, which runs ahead of the writer
+                if pages_read % PROGRESS_PAGES == 0 and next_page_token:
+                    print(f"  ... {video_count} Comments ({download.rate:.0f} Comments/s)")
+            
+            if next_page_token is None:
+                if checkpoint:
+                    checkpoint.record_video_done(video['video_id'])
+                if incremental:
+                    incremental.complete_video(video['video_id'], comment_counts.get(video['video_id']))
             
-            all_comments.extend(comments)
-            print(f"  -> {len(comments)} Comments Found")
+            print(f"  -> {video_count} Comments Found ({download.rate:.0f} Comments/s)")
+    
+    def _start_channel(self, channel_id: str) -> Dict:
+        self._local.channel_id = channel_id
+        channel_info = self.get_channel_info(channel_id)
+        
+        print(f"\nChannel Name: {channel_info['title']}")
+        print("="*60)
+        
+        return channel_info
+    
+    def scrape_channel_comments(self, channel_id: str, workers: int = None) -> tuple:
+        all_comments = []
+        
+        channel_name = self._start_channel(channel_id)['title']
+        
+        for page in self.iter_channel_comments(channel_id, channel_name, workers):
+            all_comments.extend(page)
         
         print("\n")
         print(f"Total Comments Downloaded: {len(all_comments)}")
         
         return all_comments, channel_name
     
-    def save_reports(self, comments: List[Dict], channel_name: str):
-        if not comments:
-            print("No Comments To Save")
-            return
+    def scrape_channel_to_reports(self, channel_id: str, workers: int = None, resume: bool = False,
+                                  incremental: bool = False) -> tuple:
+        channel_info = self._start_channel(channel_id)
+        channel_name = channel_info['title']
+        channel_dir = self.get_channel_dir(channel_name, channel_id)
+        
+        incremental_state = IncrementalState(channel_dir) if incremental else None
+        with self._failures_lock:
+            self.failures[channel_id] = []
         
-        reports_dir = Path('reports')
-        reports_dir.mkdir(exist_ok=True)
+        checkpoint = Checkpoint(channel_dir / 'checkpoint.jsonl', resume=resume)
+        if checkpoint.resuming:
+            print(f"Resuming Run {checkpoint.timestamp} ({checkpoint.comment_count} Comments Already Saved)")
+        else:
+            checkpoint.record_start(datetime.now().strftime('%Y%m%d_%H%M%S'))
+        run = checkpoint.timestamp
         
-        safe_channel_name = self.sanitize_filename(channel_name)
-        channel_dir = reports_dir / safe_channel_name
-        channel_dir.mkdir(exist_ok=True)
+        # Every page goes straight into the comment store; the report files are exported from it at the end
+        self.store.upsert_channel(channel_id, channel_info, run)
+        comment_count = checkpoint.comment_count
         
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        video_titles = lambda: {video['video_id']: video['title'] for video in checkpoint.videos}
+        
+        try:
+            for page in self.iter_channel_comments(channel_id, channel_name, workers, checkpoint, incremental_state):
+                self.store.upsert_comments(page, run)
+                comment_count += len(page)
+        except QuotaBudgetExhausted as e:
+            self.store.upsert_videos(channel_id, checkpoint.videos, run)
+            checkpoint.close()
+            print(f"\n⏸️ {e}")
+            print("Progress Saved - Run Again With --resume After The Daily Quota Reset")
+            self.scheduler.print_usage(channel_id, video_titles(), self.keys)
+            self.run_summaries[channel_id] = {
+                'channel_id': channel_id,
+                'channel_name': channel_name,
+                'status': 'quota_exhausted',
+                'comments': comment_count,
+                'videos': len(checkpoint.videos),
+                'report': None,
+                'quota_units': self.scheduler.channel_units.get(channel_id, 0),
+                'failed_videos': 0
+            }
+            return comment_count, channel_name, None
+        except BaseException:
+            self.store.upsert_videos(channel_id, checkpoint.videos, run)
+            checkpoint.close()
+            print("\n⚠️ Download Interrupted - Run Again With --resume To Continue")
+            raise
+        
+        self.store.upsert_videos(channel_id, checkpoint.videos, run)
+        writer = self.export_reports(channel_id, channel_dir, run, new_only=incremental,
+                                     channel=dict(channel_info, channel_id=channel_id))
+        
+        print("\n")
+        print(f"Total Comments Downloaded: {writer.comment_count}")
+        json_file = writer.close()
         
-        json_file = channel_dir / f'youtube_comments_{timestamp}.json'
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(comments, f, ensure_ascii=False, indent=2)
-        print(f"\n✅ Json Saved: {json_file}")
+        with open(channel_dir / f'quota_usage_{run}.json', 'w', encoding='utf-8') as f:
+            json.dump(self.scheduler.usage(channel_id, video_titles(), self.keys), f, indent=2)
+        self.scheduler.print_usage(channel_id, video_titles(), self.keys)
         
-        csv_file = channel_dir / f'youtube_comments_{timestamp}.csv'
-        if comments:
-            keys = comments[0].keys()
-            with open(csv_file, 'w', encoding='utf-8', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=keys)
-                writer.writeheader()
-                writer.writerows(comments)
-        print(f"✅ Csv Saved: {csv_file}")
+        with self._failures_lock:
+            failures = list(self.failures[channel_id])
+        if failures:
+            failures_file = channel_dir / f'failures_{run}.jsonl'
+            with open(failures_file, 'w', encoding='utf-8') as f:
+                for failure in failures:
+                    f.write(json.dumps(failure, ensure_ascii=False) + '\n')
+            print(f"\n⚠️ {len(failures)} Requests Failed - Details Saved: {failures_file}")
         
+        incomplete = not checkpoint.videos_complete or any(not failure['permanent'] for failure in failures)
+        if incomplete:
+            # Keep the journal so --resume lists the remaining videos and retries only the failed ones
+            checkpoint.close()
+            print("Run Again With --resume To Continue")
+        else:
+            checkpoint.finish()
+        
+        if incremental_state:
+            incremental_state.save()
+        
+        self.run_summaries[channel_id] = {
+            'channel_id': channel_id,
+            'channel_name': channel_name,
+            'status': 'incomplete' if incomplete else 'complete' if json_file else 'no_comments',
+            'comments': writer.comment_count,
+            'videos': len(checkpoint.videos),
+            'report': json_file,
+            'quota_units': self.scheduler.channel_units.get(channel_id, 0),
+            'failed_videos': sum(1 for failure in failures if failure['video_id'])
+        }
+        
+        return writer.comment_count, channel_name, json_file
+    
+    def export_reports(self, channel_id: str, channel_dir: Path, run: str, new_only: bool = False,
+                       channel: Dict = None) -> ReportWriter:
+        # A normal run exports every comment it saw; an incremental run only the ones that are new
+        writer = ReportWriter(channel_dir, run, self.output_format, self.compression, self.parquet,
+                              self.normalized, channel, self.sharded_html)
         try:
-            from html_report_generator import generate_html_report
-            html_file = channel_dir / f'youtube_comments_report_{timestamp}.html'
-            generate_html_report(str(json_file), str(html_file))
-        except ImportError:
-            print("⚠️ Html Report Generator Not Found - Skipping Html Generation")
+            for batch in self.store.iter_comments(channel_id, run, new_only=new_only):
+                writer.write(batch)
+        except BaseException:
+            writer.abort()
+            raise
+        return writer
+    
+    def get_channel_dir(self, channel_name: str, channel_id: str = None) -> Path:
+        # The channel id keeps channels whose names sanitize alike from sharing a folder,
+        # and with it their checkpoint and incremental state
+        folder = self.sanitize_filename(channel_name)
+        if channel_id:
+            folder = f'{folder}_{channel_id}'
+        channel_dir = Path('reports') / folder
+        channel_dir.mkdir(parents=True, exist_ok=True)
+        return channel_dir
+    
+    def save_reports(self, comments: List[Union[Comment, Dict]], channel_name: str, channel_id: str = None):
+        if not comments:
+            print("No Comments To Save")
+            return
+        
+        writer = ReportWriter(self.get_channel_dir(channel_name, channel_id), output_format=self.output_format,
+                              compression=self.compression, parquet=self.parquet, normalized=self.normalized,
+                              sharded_html=self.sharded_html)
+        writer.write(comments)
+        return writer.close()
+
+def read_batch_file(batch_file: str) -> List[str]:
+    entries = []
+    with open(batch_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#') and line not in entries:
+                entries.append(line)
+    return entries
+
+
+def run_batch(scraper: YouTubeCommentsScraper, batch_file: str, channel_workers: int = 2,
+              resume: bool = False, incremental: bool = False) -> Optional[str]:
+    entries = read_batch_file(batch_file)
+    if not entries:
+        print(f"❌ No Channels Found In {batch_file}")
+        return None
+    
+    print(f"\nBatch Of {len(entries)} Channels, {channel_workers} At A Time")
+    
+    summaries = {entry: {'input': entry, 'status': 'pending'} for entry in entries}
+    channel_ids = {}
+    for entry in entries:
+        try:
+            channel_id = scraper.resolve_channel(entry)
+        except QuotaBudgetExhausted as e:
+            print(f"\n⏸️ {e}")
+            break
+        if not channel_id:
+            print(f"❌ Unable To Find Channel: {entry}")
+            summaries[entry]['status'] = 'not_found'
+        elif channel_id in channel_ids.values():
+            summaries[entry].update({'channel_id': channel_id, 'status': 'duplicate'})
+        else:
+            channel_ids[entry] = channel_id
+    
+    def scrape(entry):
+        try:
+            scraper.scrape_channel_to_reports(channel_ids[entry], resume=resume, incremental=incremental)
+            summaries[entry].update(scraper.run_summaries[channel_ids[entry]])
         except Exception as e:
-            print(f"⚠️ Error Generating Html Report: {e}")
-        return str(json_file)
+            print(f"\n❌ Error Downloading {entry}: {e}")
+            summaries[entry].update({'channel_id': channel_ids[entry], 'status': 'error', 'error': str(e)})
+    
+    with ThreadPoolExecutor(max_workers=max(1, channel_workers), thread_name_prefix='channel') as executor:
+        list(executor.map(scrape, channel_ids))
+    
+    reports_dir = Path('reports')
+    reports_dir.mkdir(exist_ok=True)
+    manifest_file = reports_dir / f"batch_manifest_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    manifest = {
+        'batch_file': str(batch_file),
+        'finished_at': datetime.now().isoformat(timespec='seconds'),
+        'quota_units_today': scraper.scheduler.spent_today,
+        'keys': scraper.keys.usage(),
+        'channels': list(summaries.values())
+    }
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    
+    print("\n" + "="*60)
+    for summary in summaries.values():
+        print(f"{summary['status']:>16}  {summary.get('comments', 0):>9} Comments  {summary['input']}")
+    print(f"\n✅ Batch Manifest Saved: {manifest_file}")
+    
+    return str(manifest_file)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Youtube Comments Scraper')
+    parser.add_argument('--api-key', action='append', default=None,
+                        help='Api Key To Use, Repeat To Spread Requests Over Several Keys')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help='Number Of Videos To Download In Parallel (Default: %(default)s)')
+    parser.add_argument('--batch', metavar='FILE',
+                        help='Non-Interactive: Download Every Channel Id, Handle Or Url Listed In FILE (One Per Line)')
+    parser.add_argument('--channel-workers', type=int, default=2,
+                        help='Channels Downloaded At The Same Time In Batch Mode (Default: %(default)s)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue The Last Interrupted Download Of The Channel')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only Download Comments Newer Than The Previous Runs Of The Channel')
+    parser.add_argument('--quota-budget', type=int, default=DEFAULT_DAILY_BUDGET,
+                        help='Daily Api Quota Units Available Per Key (Default: %(default)s)')
+    parser.add_argument('--quota-reserve', type=int, default=DEFAULT_RESERVE,
+                        help='Units Left Unspent When Stopping Near The Budget (Default: %(default)s)')
+    parser.add_argument('--quota-wait', action='store_true',
+                        help='Pause Until The Daily Quota Reset Instead Of Stopping')
+    parser.add_argument('--qps', type=float, default=None,
+                        help='Maximum Api Requests Per Second (Default: Unlimited)')
+    parser.add_argument('--no-reply-expansion', action='store_true',
+                        help='Keep Only The Replies Inlined In Comment Threads (Saves Quota On Long Threads)')
+    parser.add_argument('--cache', action='store_true',
+                        help='Cache Api Responses On Disk And Reuse Them Until They Expire')
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help='Response Cache Size Limit, Least Recently Used Entries Are Evicted (Default: %(default)s)')
+    parser.add_argument('--offline', action='store_true',
+                        help='Serve Every Api Request From The Response Cache Only (No Network, No Quota)')
+    parser.add_argument('--max-retries', type=int, default=5,
+                        help='Retries For Transient Api And Network Errors (Default: %(default)s)')
+    parser.add_argument('--db', default=str(DEFAULT_DB_FILE),
+                        help='SQLite Database Holding Every Downloaded Comment (Default: %(default)s)')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='jsonl',
+                        help='Comments File Format: Json Lines Or A Single Json Array (Default: %(default)s)')
+    parser.add_argument('--compress', choices=list(COMPRESSIONS), default='none',
+                        help='Compress The Json And Csv Reports (zstd Needs The zstandard Package) (Default: %(default)s)')
+    parser.add_argument('--parquet', action='store_true',
+                        help='Also Export A Parquet File For pandas / Arrow (Needs The pyarrow Package)')
+    parser.add_argument('--normalized', action='store_true',
+                        help='Save Video And Channel Details Once In A .meta.json Instead Of On Every Comment')
+    parser.add_argument('--sharded-html', action='store_true',
+                        help='Split The Html Report Data Into Monthly Files Loaded On Demand (For Very Large Channels)')
+    parser.add_argument('--transport', choices=TRANSPORTS, default='httplib2',
+                        help='Http Client For Api Requests, httpx Uses Http/2 When h2 Is Installed (Default: %(default)s)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help='Seconds Before An Api Request Times Out And Is Retried (Default: %(default)s)')
+    parser.add_argument('--no-gzip', action='store_true',
+                        help='Ask For Uncompressed Api Responses')
+    return parser.parse_args()
 
 
 def main():
+    args = parse_args()
+    
     print ("\n")
     print("Youtube Comments Scraper")
     
-    if YOUTUBE_API_KEY == "YOUR_API_KEY_HERE" or not YOUTUBE_API_KEY:
+    # Several keys can be given comma separated, or with --api-key once per key
+    api_keys = args.api_key or [key.strip() for key in YOUTUBE_API_KEY.split(',') if key.strip()]
+    
+    if args.offline and not api_keys:
+        api_keys = ['offline']
+    
+    if not api_keys or "YOUR_API_KEY_HERE" in api_keys:
         print("\n❌ Error: You Must Insert Your Api Key")
         print("Follow The Instructions In Readme To Get An Api Key...")
         return
     
-    scraper = YouTubeCommentsScraper(YOUTUBE_API_KEY)
+    if args.compress == 'zstd' and not zstd_available():
+        print("\n❌ Error: Zstd Compression Needs The zstandard Package (pip install zstandard)")
+        return
+    
+    if args.parquet:
+        from parquet_export import parquet_available
+        if not parquet_available():
+            print("\n❌ Error: Parquet Export Needs The pyarrow Package (pip install pyarrow)")
+            return
+    
+    if args.transport == 'httpx' and not httpx_available():
+        print("\n❌ Error: The httpx Transport Needs The httpx Package (pip install httpx[http2])")
+        return
+    
+    scheduler = QuotaScheduler(
+        daily_budget=args.quota_budget, qps=args.qps,
+        reserve=args.quota_reserve, wait_for_reset=args.quota_wait,
+        retry=RetryPolicy(max_attempts=args.max_retries + 1)
+    )
+    cache = None
+    if args.cache or args.offline:
+        cache = ResponseCache(max_bytes=args.cache_max_mb * 1024 * 1024, offline=args.offline)
+    
+    # Video downloads and reply expansion each run up to --workers requests at once,
+    # plus one video listing per channel in batch mode
+    transport = create_transport(
+        args.transport, pool_size=2 * args.workers + (args.channel_workers if args.batch else 0),
+        timeout=args.timeout, gzip=not args.no_gzip
+    )
+    
+    scraper = YouTubeCommentsScraper(
+        api_keys, workers=args.workers, scheduler=scheduler, cache=cache,
+        expand_replies=not args.no_reply_expansion, store=CommentStore(args.db),
+        output_format=args.format, compression=args.compress, parquet=args.parquet,
+        normalized=args.normalized, sharded_html=args.sharded_html, transport=transport
+    )
+    
+    if args.batch:
+        try:
+            run_batch(scraper, args.batch, args.channel_workers, resume=args.resume, incremental=args.incremental)
+        finally:
+            scraper.close()
+        return
     
     print("How Do You Want To Identify The Channel...?")
     print ("\n")
@@ -337,14 +1057,14 @@ def main():
     
     print("Download Started")
     
-    all_comments, channel_name = scraper.scrape_channel_comments(channel_id)
+    comment_count, channel_name, json_file = scraper.scrape_channel_to_reports(
+        channel_id, resume=args.resume, incremental=args.incremental
+    )
     
-    if not all_comments:
+    if not comment_count:
         print("\n⚠️ No Comments Found")
         return
     
-    scraper.save_reports(all_comments, channel_name)
-    
     print ("\n")
 
 if __name__ == '__main__':